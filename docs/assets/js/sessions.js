@@ -29,6 +29,7 @@ async function loadSessions() {
 
         const catalog = await response.json();
         allSessions = catalog.sessions || [];
+        allSessions.forEach(buildSearchText);
         filteredSessions = [...allSessions];
 
         if (allSessions.length === 0) {
@@ -63,6 +64,19 @@ function populateTopicFilter() {
     });
 }
 
+// Lowercased search haystack, built once per session at load instead of
+// re-lowercasing title/summary/topics/keywords on every keystroke. Fields are
+// joined with '\n' (which the search box can't produce) so a match never
+// spans two fields — same results as testing each field separately.
+function buildSearchText(session) {
+    session._searchText = [
+        session.title,
+        session.summary,
+        ...session.topics,
+        ...session.keywords,
+    ].join('\n').toLowerCase();
+}
+
 function filterSessions() {
     const searchTerm = document.getElementById('search-input').value.toLowerCase();
     const selectedTopic = document.getElementById('filter-topic').value;
@@ -70,11 +84,7 @@ function filterSessions() {
 
     filteredSessions = allSessions.filter(session => {
         // Filter by search term
-        const matchesSearch = !searchTerm ||
-            session.title.toLowerCase().includes(searchTerm) ||
-            session.summary.toLowerCase().includes(searchTerm) ||
-            session.topics.some(t => t.toLowerCase().includes(searchTerm)) ||
-            session.keywords.some(k => k.toLowerCase().includes(searchTerm));
+        const matchesSearch = !searchTerm || session._searchText.includes(searchTerm);
 
         // Filter by topic
         const matchesTopic = !selectedTopic || session.topics.includes(selectedTopic);
@@ -7,7 +7,8 @@ Discover new Asamblea Nacional session videos using yt-dlp (no YouTube API key).
 Flow:
   1. List every video on the channel (flat playlist — fast, no per-video calls).
   2. Filter to videos that don't have a data/sessions/<id>.json yet.
-  3. For each candidate, fetch metadata (title, upload_date) via yt-dlp.
+  3. Fetch metadata (title, upload_date) for the candidates via yt-dlp,
+     batched METADATA_BATCH_SIZE videos per process.
   4. Optionally filter by --since YYYY-MM-DD.
   5. Append new videos to data/sessions/index.json.
 
@@ -21,10 +22,15 @@ the index — useful for "catch up" runs after the local pipeline has been idle.
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import random
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -44,13 +50,73 @@ CHANNEL_TABS = {
 # with the real multi-hour streams, e.g. "Sesión 104 del Pleno..." at 63s vs
 # "Sesión No. 104-AN-2025-2029 del pleno..." at 17087s — title alone lies).
 FULL_SESSION_MIN_SECONDS = 1800  # 30 min
+# Videos per yt-dlp metadata process — see fetch_metadata_batch().
+METADATA_BATCH_SIZE = 50
 COOKIES_FILE = PROJECT_ROOT / "temp" / "cookies" / "youtube.txt"
+# yt-dlp responses cached between runs. Lives under temp/, never data/ —
+# data/ is mirrored wholesale to docs/data for GitHub Pages.
+CACHE_DIR = PROJECT_ROOT / "temp" / "cache" / "discover"
+# Plain-text list of the index's video_ids — see load_known_ids().
+IDS_PATH = CACHE_DIR / "index.ids"
+# A tab listing goes stale as soon as the channel uploads, so keep it just
+# long enough that re-running discovery right after a failure is free.
+# Per-video metadata (upload date, duration) effectively never changes.
+LISTING_TTL_SECONDS = 3600
+METADATA_TTL_SECONDS = 30 * 24 * 3600
+
+
+# stderr markers for YouTube's "stop talking to me" responses. Retrying
+# these only digs the hole deeper (2026-07-09: a burst of retries turned a
+# bot check into an hour-long rate-limit), so they end the run instead.
+BLOCKED_MARKERS = ("Sign in to confirm", "rate-limited", "HTTP Error 429")
+# Network hiccups worth retrying with backoff.
+TRANSIENT_MARKERS = (
+    "HTTP Error 5", "timed out", "Connection reset", "Temporary failure in name resolution",
+    "Remote end closed connection", "IncompleteRead",
+)
+MAX_ATTEMPTS = 4
 
 
 def _cookie_args() -> list[str]:
     return ["--cookies", str(COOKIES_FILE)] if COOKIES_FILE.exists() else []
 
 
+def _is_blocked(stderr: str) -> bool:
+    return any(m in stderr for m in BLOCKED_MARKERS)
+
+
+def _is_transient(stderr: str) -> bool:
+    return any(m in stderr for m in TRANSIENT_MARKERS)
+
+
+def _backoff(attempt: int) -> None:
+    """Exponential backoff with jitter: ~5s, 10s, 20s … capped at 60s."""
+    delay = min(60.0, 5.0 * 2 ** attempt) + random.uniform(0, 1)
+    print(f"  transient yt-dlp error, retrying in {delay:.0f}s …")
+    time.sleep(delay)
+
+
+def _cache_path(*key: str) -> Path:
+    return CACHE_DIR / f"{hashlib.sha1(repr(key).encode()).hexdigest()}.json"
+
+
+def cache_get(*key: str, ttl: float):
+    """Cached value for `key` if written less than `ttl` seconds ago, else None."""
+    path = _cache_path(*key)
+    try:
+        if time.time() - path.stat().st_mtime > ttl:
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def cache_put(value, *key: str) -> None:
+    path = _cache_path(*key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(value, ensure_ascii=False), encoding="utf-8")
+
+
 def load_index() -> dict:
     if INDEX_PATH.exists():
         with open(INDEX_PATH, encoding="utf-8") as f:
@@ -58,20 +124,41 @@ def load_index() -> dict:
     return {"sessions": [], "last_updated": None}
 
 
+def load_known_ids() -> frozenset[str]:
+    """video_ids already in the index, for membership checks only.
+
+    Reads the one-id-per-line sidecar save_index() writes to CACHE_DIR
+    instead of parsing the whole index (1000+ entries with
+    titles/descriptions) just to build a set. Falls back to the JSON when
+    the sidecar is missing or older than the index (hand edits).
+    """
+    if IDS_PATH.exists() and (not INDEX_PATH.exists() or IDS_PATH.stat().st_mtime >= INDEX_PATH.stat().st_mtime):
+        return frozenset(IDS_PATH.read_text(encoding="utf-8").split())
+    return frozenset(s["video_id"] for s in load_index().get("sessions", []))
+
+
 def save_index(data: dict) -> None:
     INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
     with open(INDEX_PATH, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
+    IDS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    IDS_PATH.write_text("\n".join(s["video_id"] for s in data["sessions"]) + "\n", encoding="utf-8")
     print(f"✓ Wrote {INDEX_PATH} ({len(data['sessions'])} sessions total)")
 
 
-def list_channel_videos(channel_url: str) -> list[tuple[str, str, float | None]]:
+def list_channel_videos(channel_url: str, refresh: bool = False) -> list[tuple[str, str, float | None]]:
     """Return all (video_id, title, duration_seconds) in a channel tab, newest first.
 
     Uses flat-playlist mode: fast, no per-video calls, no YouTube bot
     challenges. Duration comes for free from the flat listing; upload_date
     does not — that's fetched lazily later via fetch_metadata().
+    Served from the on-disk cache if listed within LISTING_TTL_SECONDS.
     """
+    if not refresh:
+        cached = cache_get("listing", channel_url, ttl=LISTING_TTL_SECONDS)
+        if cached is not None:
+            print(f"Listing videos from {channel_url} … (cached, {len(cached)} videos)")
+            return [tuple(v) for v in cached]
     print(f"Listing videos from {channel_url} …")
     cmd = [
         "yt-dlp",
@@ -80,10 +167,19 @@ def list_channel_videos(channel_url: str) -> list[tuple[str, str, float | None]]
         "--print", "%(id)s\t%(title)s\t%(duration)s",
         channel_url,
     ]
-    r = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            r = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+        except subprocess.TimeoutExpired:
+            r = subprocess.CompletedProcess(cmd, 1, "", "listing timed out (600s)")
+        if r.returncode == 0 or _is_blocked(r.stderr) or not _is_transient(r.stderr):
+            break
+        if attempt < MAX_ATTEMPTS - 1:
+            _backoff(attempt)
     if r.returncode != 0:
         print(f"  yt-dlp failed: {r.stderr[-300:]}", file=sys.stderr)
-        sys.exit(1)
+        # 2 = YouTube is blocking us: wait it out rather than re-running now.
+        sys.exit(2 if _is_blocked(r.stderr) else 1)
     videos: list[tuple[str, str, float | None]] = []
     for line in r.stdout.splitlines():
         if "\t" not in line:
@@ -99,30 +195,13 @@ def list_channel_videos(channel_url: str) -> list[tuple[str, str, float | None]]
         if vid:
             videos.append((vid, title, duration))
     print(f"  tab has {len(videos)} videos")
+    cache_put(videos, "listing", channel_url)
     return videos
 
 
-def fetch_metadata(video_id: str) -> dict | None:
-    """Fetch title + upload_date + duration for a single video. None on failure."""
-    url = f"https://www.youtube.com/watch?v={video_id}"
-    cmd = [
-        "yt-dlp",
-        *_cookie_args(),
-        "--extractor-args", "youtube:player_client=android_vr,ios,web",
-        "--no-warnings", "--skip-download",
-        "--print", "%(id)s\t%(title)s\t%(upload_date)s\t%(channel)s\t%(duration)s",
-        url,
-    ]
-    try:
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-    except subprocess.TimeoutExpired:
-        return None
-    if r.returncode != 0:
-        return None
-    line = r.stdout.strip().splitlines()
-    if not line:
-        return None
-    parts = line[0].split("\t")
+def _parse_metadata_line(line: str) -> dict | None:
+    """Parse one `%(id)s\t%(title)s\t%(upload_date)s\t%(channel)s\t%(duration)s` line."""
+    parts = line.split("\t")
     if len(parts) < 3:
         return None
     vid, title, upload_date, *rest = parts
@@ -145,11 +224,72 @@ def fetch_metadata(video_id: str) -> dict | None:
         "published_at": published_at,
         "channel_title": channel,
         "duration": duration,
-        "url": url,
+        "url": f"https://www.youtube.com/watch?v={vid}",
         "discovered_at": datetime.now().isoformat(),
     }
 
 
+def fetch_metadata_batch(
+    video_ids: list[str], batch_size: int = METADATA_BATCH_SIZE, refresh: bool = False,
+) -> dict[str, dict]:
+    """Fetch title + upload_date + duration for many videos, {video_id: meta}.
+
+    One yt-dlp process per `batch_size` ids instead of one per video: each
+    spawn pays interpreter startup + extractor init (~1-2s) before the first
+    request even goes out, which dominated discovery runs of a few hundred
+    candidates. --ignore-errors keeps one bot-challenged video from sinking
+    the rest of its batch; ids missing from the result failed individually.
+    Only successful fetches are cached, so failures get retried next run.
+    """
+    results: dict[str, dict] = {}
+    pending: list[str] = []
+    for vid in video_ids:
+        cached = None if refresh else cache_get("metadata", vid, ttl=METADATA_TTL_SECONDS)
+        if cached is not None:
+            results[vid] = {**cached, "discovered_at": datetime.now().isoformat()}
+        else:
+            pending.append(vid)
+    if len(pending) < len(video_ids):
+        print(f"  {len(video_ids) - len(pending)} served from cache")
+    ids = iter(pending)
+    while chunk := list(islice(ids, batch_size)):
+        for attempt in range(MAX_ATTEMPTS):
+            cmd = [
+                "yt-dlp",
+                *_cookie_args(),
+                "--extractor-args", "youtube:player_client=android_vr,ios,web",
+                "--no-warnings", "--skip-download", "--ignore-errors",
+                "--print", "%(id)s\t%(title)s\t%(upload_date)s\t%(channel)s\t%(duration)s",
+                *(f"https://www.youtube.com/watch?v={vid}" for vid in chunk),
+            ]
+            try:
+                r = subprocess.run(cmd, capture_output=True, text=True, timeout=60 * len(chunk))
+            except subprocess.TimeoutExpired:
+                r = subprocess.CompletedProcess(cmd, 1, "", "batch timed out")
+            # Non-zero exit with --ignore-errors just means *some* video failed;
+            # whatever did print is still good.
+            for line in r.stdout.splitlines():
+                meta = _parse_metadata_line(line.strip())
+                if meta:
+                    results[meta["video_id"]] = meta
+                    cache_put(meta, "metadata", meta["video_id"])
+            if _is_blocked(r.stderr):
+                # Everything fetched so far is cached, so the next run
+                # resumes from here instead of re-fetching.
+                print("  YouTube bot check / rate limit hit — stopping metadata fetch for this run", file=sys.stderr)
+                return results
+            chunk = [vid for vid in chunk if vid not in results]
+            if not chunk or not _is_transient(r.stderr) or attempt == MAX_ATTEMPTS - 1:
+                break
+            _backoff(attempt)
+    return results
+
+
+def fetch_metadata(video_id: str) -> dict | None:
+    """Fetch title + upload_date + duration for a single video. None on failure."""
+    return fetch_metadata_batch([video_id]).get(video_id)
+
+
 def classify_video_type(tab: str, duration: float | None) -> str:
     """Duration wins over title/tab — some short trailer clips share
     near-identical titles with the real multi-hour streams."""
@@ -163,27 +303,36 @@ def main() -> int:
     parser.add_argument("--since", help="Only discover videos published on/after YYYY-MM-DD (default: include all)")
     parser.add_argument("--limit", type=int, default=200, help="Max new candidates to inspect this run (default: 200)")
     parser.add_argument("--rebuild", action="store_true", help="Reinspect even videos already in the index")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached yt-dlp listings/metadata in temp/cache/discover")
     args = parser.parse_args()
 
     print("=" * 60)
     print("01_DISCOVER_VIDEOS — yt-dlp based")
     print("=" * 60)
 
-    index = load_index()
-    known: dict[str, dict] = {s["video_id"]: s for s in index.get("sessions", [])}
+    known = load_known_ids()
     processed = {f.stem for f in DATA_SESSIONS.iterdir() if f.suffix == ".json" and f.stem != "index"}
 
     # Candidate = in channel, not in index (or --rebuild). Collected from
     # BOTH tabs; each candidate carries which tab it came from so we can
     # classify video_type even if the later per-video metadata fetch (which
     # also returns duration) gets bot-rate-limited.
+    # The tabs are independent listings, so run them side by side — each is
+    # a multi-second yt-dlp crawl of the whole tab.
+    with ThreadPoolExecutor(max_workers=len(CHANNEL_TABS)) as pool:
+        listings = dict(zip(CHANNEL_TABS, pool.map(
+            lambda url: list_channel_videos(url, refresh=args.refresh), CHANNEL_TABS.values(),
+        )))
+
     candidates: list[tuple[str, str, float | None, str]] = []
-    for tab, channel_url in CHANNEL_TABS.items():
-        for vid, title, duration in list_channel_videos(channel_url):
+    seen: set[str] = set()
+    for tab, videos in listings.items():
+        for vid, title, duration in videos:
             if not args.rebuild and vid in known:
                 continue
-            if any(c[0] == vid for c in candidates):
+            if vid in seen:
                 continue
+            seen.add(vid)
             candidates.append((vid, title, duration, tab))
             if len(candidates) >= args.limit:
                 break
@@ -201,11 +350,13 @@ def main() -> int:
     # sometimes rate-limits this with "Sign in to confirm you're not a bot";
     # in that case we fall back to the flat-playlist title/duration and
     # leave published_at empty so the entry can still be queued.
+    print(f"Fetching metadata in batches of {METADATA_BATCH_SIZE} …")
+    fetched = fetch_metadata_batch([c[0] for c in candidates], refresh=args.refresh)
     added: list[dict] = []
     skipped_old = 0
     fallback_used = 0
     for i, (vid, flat_title, flat_duration, tab) in enumerate(candidates, 1):
-        meta = fetch_metadata(vid)
+        meta = fetched.get(vid)
         if not meta:
             fallback_used += 1
             meta = {
@@ -237,7 +388,8 @@ def main() -> int:
         print("\nNo new sessions matching the filters.")
         return 0
 
-    # Merge into index — newest first
+    # Merge into index — newest first. Only now is the full index needed.
+    index = load_index()
     by_id = {s["video_id"]: s for s in index.get("sessions", [])}
     for m in added:
         by_id[m["video_id"]] = m
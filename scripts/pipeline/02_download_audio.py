@@ -9,14 +9,26 @@ Audio files are stored temporarily and should not be committed to git.
 
 import os
 import sys
+import json
 import argparse
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.append(str(PROJECT_ROOT))
 
+# Parallel fragment downloads within a single file
+CONCURRENT_FRAGMENTS = 4
+
+# Parallel downloads when several video IDs are given
+DEFAULT_WORKERS = 3
+
+# Max seconds an existing audio file may differ from the video's duration
+# and still be reused instead of re-downloaded
+DURATION_TOLERANCE = 2.0
+
 
 def download_audio(video_id, output_dir):
     """
@@ -34,9 +46,19 @@ def download_audio(video_id, output_dir):
 
     video_url = f"https://www.youtube.com/watch?v={video_id}"
     output_template = str(output_dir / f"{video_id}.%(ext)s")
+    audio_file = output_dir / f"{video_id}.m4a"
+
+    # Re-runs: skip the download + re-encode if a complete file is already there
+    if audio_file.exists() and is_complete_download(video_id, audio_file, output_dir):
+        print(f"✓ Audio already downloaded (cache hit): {audio_file}")
+        return audio_file
 
     print(f"Downloading audio from {video_url}...")
 
+    # yt-dlp's stderr goes to a per-video log file rather than a pipe: with
+    # several downloads in flight, capture_output would hold every
+    # process's progress/ffmpeg output in RAM until it exits.
+    log_path = output_dir / f"{video_id}.yt-dlp.log"
     try:
         # Use yt-dlp to download audio-only stream
         cmd = [
@@ -45,30 +67,31 @@ def download_audio(video_id, output_dir):
             '--audio-format', 'm4a',  # Convert to M4A format
             '--audio-quality', '0',  # Best quality
             '--no-playlist',  # Don't download playlists
+            # Fetch DASH fragments in parallel within one file
+            '--concurrent-fragments', str(CONCURRENT_FRAGMENTS),
             '--output', output_template,
             '--no-warnings',  # Suppress warnings
             '--no-progress',  # No progress bar (for cleaner logs)
             video_url
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-
-        # Determine output file path
-        audio_file = output_dir / f"{video_id}.m4a"
+        with open(log_path, 'w') as log_file:
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=log_file, check=True)
 
         if audio_file.exists():
             file_size_mb = audio_file.stat().st_size / (1024 * 1024)
             print(f"✓ Audio downloaded successfully: {audio_file}")
             print(f"  File size: {file_size_mb:.2f} MB")
+            log_path.unlink(missing_ok=True)
             return audio_file
         else:
             print(f"Error: Audio file not found at {audio_file}")
             return None
 
     except subprocess.CalledProcessError as e:
-        print(f"Error downloading audio: {e}")
-        print(f"STDOUT: {e.stdout}")
-        print(f"STDERR: {e.stderr}")
+        print(f"Error downloading audio for {video_id}: {e}")
+        print(f"STDERR (tail, full log in {log_path}):")
+        print(log_path.read_text(errors='ignore')[-1000:])
         return None
     except FileNotFoundError:
         print("Error: yt-dlp not found. Please install it:")
@@ -76,17 +99,62 @@ def download_audio(video_id, output_dir):
         return None
 
 
-def get_video_info(video_id):
+def download_many(video_ids, output_dir, workers=DEFAULT_WORKERS):
+    """
+    Download audio for several videos concurrently
+
+    Each download is a yt-dlp subprocess that mostly waits on the network,
+    so a small thread pool is enough to overlap them. Keep `workers` low:
+    bursts of parallel downloads are what trip YouTube's rate limiting.
+
+    Args:
+        video_ids: YouTube video IDs
+        output_dir: Directory to save audio files
+        workers: Max downloads in flight
+
+    Returns:
+        Dictionary of video_id -> Path (None for failed downloads)
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(download_audio, vid, output_dir): vid for vid in video_ids}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
+
+def pending_index_ids():
+    """Video IDs in data/sessions/index.json without a processed session file yet"""
+    sessions_dir = PROJECT_ROOT / "data" / "sessions"
+    with open(sessions_dir / "index.json", 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    return [
+        s['video_id'] for s in index.get('sessions', [])
+        if not (sessions_dir / f"{s['video_id']}.json").exists()
+    ]
+
+
+def get_video_info(video_id, cache_dir=None):
     """
     Get video metadata using yt-dlp
 
     Args:
         video_id: YouTube video ID
+        cache_dir: If given, read/write a {video_id}.info.json sidecar there
+            so repeat lookups skip the yt-dlp call
 
     Returns:
         Dictionary with video metadata
     """
     video_url = f"https://www.youtube.com/watch?v={video_id}"
+    sidecar = Path(cache_dir) / f"{video_id}.info.json" if cache_dir else None
+
+    if sidecar and sidecar.exists():
+        try:
+            with open(sidecar, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            pass
 
     try:
         cmd = [
@@ -98,16 +166,20 @@ def get_video_info(video_id):
 
         result = subprocess.run(cmd, capture_output=True, text=True, check=True)
 
-        import json
         metadata = json.loads(result.stdout)
 
-        return {
+        info = {
             'title': metadata.get('title'),
             'duration': metadata.get('duration'),  # in seconds
             'upload_date': metadata.get('upload_date'),
             'uploader': metadata.get('uploader'),
             'description': metadata.get('description')
         }
+        if sidecar:
+            sidecar.parent.mkdir(parents=True, exist_ok=True)
+            with open(sidecar, 'w', encoding='utf-8') as f:
+                json.dump(info, f, ensure_ascii=False)
+        return info
 
     except subprocess.CalledProcessError as e:
         print(f"Error getting video info: {e}")
@@ -117,20 +189,61 @@ def get_video_info(video_id):
         return None
 
 
-def main():
-    """Main function"""
+def get_audio_duration(audio_file):
+    """
+    Get duration of a local audio file in seconds via ffprobe
+
+    Returns:
+        Duration in seconds, or None if ffprobe can't read the file
+    """
+    cmd = [
+        'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+        '-of', 'csv=p=0', str(audio_file)
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        return float(result.stdout.strip())
+    except (subprocess.CalledProcessError, ValueError, FileNotFoundError):
+        return None
+
+
+def is_complete_download(video_id, audio_file, output_dir):
+    """
+    Check whether an existing audio file is a complete copy of the video
+
+    A file left behind by an interrupted run is shorter than the video, so
+    compare its ffprobe duration against YouTube's within DURATION_TOLERANCE.
+    """
+    duration = get_audio_duration(audio_file)
+    if duration is None:
+        return False
+    info = get_video_info(video_id, cache_dir=output_dir)
+    if not info or not info.get('duration'):
+        return False
+    return abs(duration - info['duration']) < DURATION_TOLERANCE
+
+
+def main(argv=None):
+    """Main function (argv: argument list, default sys.argv[1:])"""
     parser = argparse.ArgumentParser(description='Download audio from YouTube video')
-    parser.add_argument('--video-id', required=True, help='YouTube video ID')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--video-id', help='YouTube video ID')
+    source.add_argument('--video-ids', help='Comma-separated YouTube video IDs, downloaded concurrently')
+    source.add_argument('--from-index', action='store_true', help='Download every video in data/sessions/index.json not yet processed')
     parser.add_argument('--output-dir', default='temp/audio', help='Output directory for audio files')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help=f'Concurrent downloads for --video-ids/--from-index (default: {DEFAULT_WORKERS})')
     parser.add_argument('--get-info', action='store_true', help='Get video metadata only')
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     print("="*60)
     print("02_DOWNLOAD_AUDIO - Extract Audio from YouTube Video")
     print("="*60)
 
     if args.get_info:
+        if not args.video_id:
+            print("--get-info requires --video-id")
+            return 1
         # Get video metadata
         info = get_video_info(args.video_id)
         if info:
@@ -144,7 +257,7 @@ def main():
         else:
             print("Failed to get video information")
             return 1
-    else:
+    elif args.video_id:
         # Download audio
         audio_file = download_audio(args.video_id, args.output_dir)
 
@@ -158,6 +271,21 @@ def main():
             print("FAILED - Could not download audio")
             print("="*60)
             return 1
+    else:
+        if args.from_index:
+            video_ids = pending_index_ids()
+        else:
+            video_ids = [v.strip() for v in args.video_ids.split(',') if v.strip()]
+        print(f"Downloading {len(video_ids)} videos ({args.workers} at a time)...")
+        results = download_many(video_ids, args.output_dir, workers=args.workers)
+        failed = [vid for vid, path in results.items() if not path]
+
+        print("="*60)
+        print(f"COMPLETE - {len(results) - len(failed)}/{len(results)} downloaded to: {args.output_dir}")
+        for vid in failed:
+            print(f"  FAILED: {vid}")
+        print("="*60)
+        return 1 if failed else 0
 
 
 if __name__ == "__main__":
@@ -11,20 +11,30 @@ Replaces 03_transcribe_elevenlabs.py. No external APIs, fully local.
 """
 
 import argparse
-import json
 import subprocess
 import sys
 import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 DIARIZE_URL = "http://localhost:8001/diarize"
 WHISPER_URL = "http://localhost:8000/transcribe"
 LANGUAGE = "es"
 
+# One keep-alive session for every call to the local servers. Bare
+# requests.post() opens (and tears down) a fresh TCP connection per
+# segment — thousands per plenary session. main() sizes the pool to
+# --workers so concurrent segment requests don't evict each other's
+# connections.
+HTTP = requests.Session()
+
 
 def to_wav_16k_mono(input_path: Path, output_path: Path) -> None:
     """Convert any audio/video file to 16kHz mono WAV."""
@@ -46,13 +56,29 @@ def get_duration(wav_path: Path) -> float:
     return float(out.stdout.strip())
 
 
+def post_wav(url: str, wav_path: Path, timeout: float, params: dict | None = None) -> requests.Response:
+    """POST a wav as multipart/form-data, streaming it from disk.
+
+    requests' own `files=` builds the entire multipart body in memory before
+    sending — for a multi-hour plenary session the 16kHz wav alone is
+    hundreds of MB. MultipartEncoder reads the file in chunks as the socket
+    drains, so peak memory stays flat regardless of file size.
+    """
+    with open(wav_path, "rb") as f:
+        encoder = MultipartEncoder(fields={"file": (wav_path.name, f, "audio/wav")})
+        r = HTTP.post(
+            url, data=encoder, params=params,
+            headers={"Content-Type": encoder.content_type}, timeout=timeout,
+        )
+    r.raise_for_status()
+    return r
+
+
 def diarize(wav_path: Path) -> dict:
     """Call diarization server, return parsed response."""
     print(f"→ Diarizing {wav_path.name} via {DIARIZE_URL} …")
     t0 = time.time()
-    with open(wav_path, "rb") as f:
-        r = requests.post(DIARIZE_URL, files={"file": (wav_path.name, f, "audio/wav")}, timeout=3600)
-    r.raise_for_status()
+    r = post_wav(DIARIZE_URL, wav_path, timeout=3600)
     data = r.json()
     print(f"  ✓ {data['num_speakers']} speakers, {len(data['segments'])} segments ({time.time()-t0:.1f}s)")
     return data
@@ -71,14 +97,7 @@ def transcribe_segment(wav_path: Path, start: float, end: float) -> tuple[str, l
         ]
         subprocess.run(cmd, check=True, capture_output=True)
 
-        with open(tmp_path, "rb") as f:
-            r = requests.post(
-                WHISPER_URL,
-                files={"file": (tmp_path.name, f, "audio/wav")},
-                params={"language": LANGUAGE},
-                timeout=600,
-            )
-        r.raise_for_status()
+        r = post_wav(WHISPER_URL, tmp_path, timeout=600, params={"language": LANGUAGE})
         data = r.json()
         return data.get("text", "").strip(), data.get("segments", [])
     finally:
@@ -119,6 +138,7 @@ def main():
     parser.add_argument("--audio-file", help="Path to audio file (default: temp/audio/<id>.m4a or data/video/<id>.mp4)")
     parser.add_argument("--output", help="Output JSON path (default: data/sessions/<id>.json)")
     parser.add_argument("--keep-wav", action="store_true", help="Keep the intermediate 16kHz wav")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent segment requests to whisper-server (default: 4)")
     args = parser.parse_args()
 
     # Find input audio
@@ -153,33 +173,38 @@ def main():
     raw_segments = merge_short_segments(diar["segments"], min_duration=0.5)
     print(f"After merge/filter: {len(raw_segments)} segments")
 
-    # Transcribe each segment
-    print(f"→ Transcribing {len(raw_segments)} segments via whisper-server …")
+    # Transcribe each segment. Requests go out `--workers` at a time so the
+    # ffmpeg slice + upload of the next segments overlaps with whisper-server
+    # decoding the current one; results are consumed in segment order.
+    print(f"→ Transcribing {len(raw_segments)} segments via whisper-server ({args.workers} in flight) …")
     final_segments = []
     full_text_parts = []
     t0 = time.time()
 
-    for idx, seg in enumerate(raw_segments):
-        try:
-            text, _internal = transcribe_segment(wav_path, seg["start"], seg["end"])
-        except Exception as e:
-            print(f"  ! segment {idx} failed: {e}")
-            text = ""
-        if not text:
-            continue
-        speaker_id = normalize_speaker_id(seg["speaker"])
-        final_segments.append({
-            "id": len(final_segments),
-            "start": round(seg["start"], 2),
-            "end": round(seg["end"], 2),
-            "text": text,
-            "speaker_id": speaker_id,
-        })
-        full_text_parts.append(text)
-
-        if (idx + 1) % 10 == 0 or idx == len(raw_segments) - 1:
-            elapsed = time.time() - t0
-            print(f"  {idx+1}/{len(raw_segments)}  elapsed={elapsed:.1f}s  rtf={elapsed/seg['end']:.2f}x")
+    HTTP.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=max(args.workers, 1)))
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(transcribe_segment, wav_path, seg["start"], seg["end"]) for seg in raw_segments]
+        for idx, (seg, future) in enumerate(zip(raw_segments, futures)):
+            try:
+                text, _internal = future.result()
+            except Exception as e:
+                print(f"  ! segment {idx} failed: {e}")
+                text = ""
+            if not text:
+                continue
+            speaker_id = normalize_speaker_id(seg["speaker"])
+            final_segments.append({
+                "id": len(final_segments),
+                "start": round(seg["start"], 2),
+                "end": round(seg["end"], 2),
+                "text": text,
+                "speaker_id": speaker_id,
+            })
+            full_text_parts.append(text)
+
+            if (idx + 1) % 10 == 0 or idx == len(raw_segments) - 1:
+                elapsed = time.time() - t0
+                print(f"  {idx+1}/{len(raw_segments)}  elapsed={elapsed:.1f}s  rtf={elapsed/seg['end']:.2f}x")
 
     print(f"✓ Transcribed {len(final_segments)} segments in {time.time()-t0:.1f}s")
 
@@ -197,8 +222,12 @@ def main():
 
     output_path = Path(args.output) if args.output else (PROJECT_ROOT / "temp" / "sessions" / f"{args.video_id}.json")
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(session, f, ensure_ascii=False, indent=2)
+    # run_batch.py writes straight to data/sessions/, and that file is kept
+    # as-is if 04_map_speakers_local.py never rewrites it, so it gets the
+    # same 2-space indent as every other session file. Only scratch output
+    # under temp/ is written compact.
+    scratch = output_path.resolve().is_relative_to((PROJECT_ROOT / "temp").resolve())
+    output_path.write_bytes(orjson.dumps(session, option=0 if scratch else orjson.OPT_INDENT_2))
     print(f"✓ Wrote {output_path}")
 
     if not args.keep_wav:
@@ -18,6 +18,7 @@ Runs on CPU (PaddleOCR). No external API calls. No GPU contention.
 """
 
 import argparse
+import hashlib
 import json
 import re
 import subprocess
@@ -25,10 +26,13 @@ import sys
 import time
 import unicodedata
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from difflib import SequenceMatcher
+from importlib.metadata import version
 from pathlib import Path
 
 import numpy as np
+import orjson
 from PIL import Image
 from paddleocr import PaddleOCR
 
@@ -39,13 +43,43 @@ SPEAKERS_DB = PROJECT_ROOT / "data" / "speakers" / "asambleistas.json"
 # ---------------------------------------------------------------------------
 # Frame extraction
 # ---------------------------------------------------------------------------
-def extract_frame(video_path: Path, timestamp: float, output_path: Path) -> bool:
-    cmd = [
-        "ffmpeg", "-y", "-ss", f"{timestamp:.3f}", "-i", str(video_path),
-        "-vframes", "1", "-q:v", "2", str(output_path),
-    ]
-    r = subprocess.run(cmd, capture_output=True, timeout=30)
-    return r.returncode == 0 and output_path.exists()
+# Widest overlay crop written to disk. Source videos are mostly 720p, so
+# this only bites on 1080p+ uploads, where the banner text stays far above
+# the size PaddleOCR needs.
+MAX_FRAME_WIDTH = 1280
+# Concurrent ffmpeg frame-extraction runs (one per speaker) while OCR works.
+EXTRACTION_WORKERS = 2
+
+
+def extract_frames(
+    video_path: Path,
+    requests: list[tuple[float, Path]],
+    band: tuple[float, float] | None = None,
+) -> None:
+    """Grab one frame per (timestamp, output_path) in a single ffmpeg run.
+
+    Each timestamp becomes its own fast-seeked input (`-ss T -i video`)
+    mapped to its own single-frame output, so N frames cost one process
+    spawn + demuxer setup instead of N. Callers check output_path.exists()
+    afterwards — a bad timestamp just leaves its file missing.
+
+    With `band=(top, bottom)` (fractions of frame height) only that
+    horizontal strip is kept, downscaled to at most MAX_FRAME_WIDTH — the
+    JPEG encode/write/decode then only touches the pixels OCR will read.
+    """
+    if not requests:
+        return
+    vf: list[str] = []
+    if band:
+        top, bottom = band
+        vf = ["-vf", f"crop=iw:ih*{bottom - top:.4f}:0:ih*{top:.4f},scale='min({MAX_FRAME_WIDTH},iw)':-2"]
+    inputs: list[str] = []
+    outputs: list[str] = []
+    for i, (ts, out_path) in enumerate(requests):
+        inputs += ["-ss", f"{ts:.3f}", "-i", str(video_path)]
+        outputs += ["-map", f"{i}:v:0", *vf, "-frames:v", "1", "-q:v", "2", str(out_path)]
+    cmd = ["ffmpeg", "-y", *inputs, *outputs]
+    subprocess.run(cmd, capture_output=True, timeout=30 + 5 * len(requests))
 
 
 def get_video_duration(video_path: Path) -> float:
@@ -72,12 +106,18 @@ SPANISH_STOPWORDS = {
 EARLY_STOP_MIN_VOTES = 3
 
 
+# Compiled once: normalize_name / looks_like_person_name run on every OCR line
+# of every sampled frame, plus every DB name when building the lookup.
+PUNCT_RE = re.compile(r"[^\w\s]")
+BANNER_DASH_RE = re.compile(r"(^|\s)-(\s|$)")
+TITLE_SUFFIX_RE = re.compile(r"\s+-\s+")
+
+
 def normalize_name(name: str) -> str:
     """Strip accents, lowercase, collapse whitespace, drop punctuation."""
     nfkd = unicodedata.normalize("NFKD", name)
     no_accents = "".join(c for c in nfkd if not unicodedata.combining(c))
-    cleaned = re.sub(r"[^\w\s]", " ", no_accents.lower())
-    return re.sub(r"\s+", " ", cleaned).strip()
+    return " ".join(PUNCT_RE.sub(" ", no_accents.lower()).split())
 
 
 def load_speakers_db() -> list[dict]:
@@ -166,7 +206,7 @@ def extract_name_from_title(title: str) -> str | None:
         return None
     # Cut off everything from " - " onward (session number, "II Intervención",
     # "Punto de información", "Cambio del orden del día", etc).
-    name = re.split(r"\s+-\s+", m.group(1))[0].strip()
+    name = TITLE_SUFFIX_RE.split(m.group(1), maxsplit=1)[0].strip()
     return name or None
 
 
@@ -218,32 +258,82 @@ def apply_title_fallback(
 # ---------------------------------------------------------------------------
 # OCR
 # ---------------------------------------------------------------------------
+# Near-duplicate detection for overlay crops. The camera often lingers on
+# one speaker, so many sampled frames show the exact same lower third; a
+# difference hash of the crop lets those reuse the first frame's OCR result
+# instead of paying ~1.6s each. The hash is deliberately fine-grained
+# (64x16 = 1024 bits): two different names on the same banner template
+# must NOT collide, and only compression noise should fit under the
+# distance threshold.
+OVERLAY_HASH_SIZE = (64, 16)
+OVERLAY_HASH_MAX_DISTANCE = 16  # differing bits, out of 1024
+
+# Recognized lines scoring below this are dropped by OverlayReader.read().
+OCR_MIN_SCORE = 0.6
+
+# OCR results persisted across runs, keyed by SHA-1 of the crop's JPEG bytes
+# plus the OCR configuration (OCR_CACHE_VERSION, PaddleOCR version, language,
+# OCR_MIN_SCORE). Frames in temp/frames/ are reused between runs, so
+# re-running the mapper (e.g. after tweaking the name filters) skips OCR
+# entirely for frames it has already read. Bump OCR_CACHE_VERSION when the
+# PaddleOCR pipeline options change. Lives under temp/, not data/ — data/ is
+# mirrored to docs/.
+OCR_CACHE_DIR = PROJECT_ROOT / "temp" / "cache" / "ocr"
+OCR_CACHE_VERSION = "v1"
+
+
+def overlay_hash(crop: Image.Image) -> np.ndarray:
+    """Difference hash: 1 bit per adjacent-pixel brightness comparison."""
+    w, h = OVERLAY_HASH_SIZE
+    small = np.asarray(crop.convert("L").resize((w + 1, h), Image.BILINEAR), dtype=np.int16)
+    return (small[:, 1:] > small[:, :-1]).ravel()
+
+
 class OverlayReader:
-    """PaddleOCR wrapper that returns names found in the lower-third overlay."""
+    """PaddleOCR wrapper that returns names found in the lower-third overlay.
+
+    read() expects images already cropped to `overlay_band` — pass the band
+    to extract_frames() so ffmpeg does the crop at extraction time.
+    """
 
     def __init__(self, lang: str = "es", overlay_band: tuple[float, float] = (0.70, 0.98)):
         # use_doc_orientation_classify/unwarping/textline_orientation are for
         # scanned-document photos (rotated pages, warped paper) — irrelevant
         # for a clean video frame, and skipping them avoids loading 3 unused
         # models. The real win is cropping to the overlay band BEFORE OCR
-        # (below) rather than running full-frame detection and filtering
-        # after: measured 2026-07-10 at 3.9s -> 1.6s per frame (2.4x), since
-        # PaddleOCR's detector cost scales with image area and we only ever
-        # care about the bottom ~28% of the frame.
+        # (done by extract_frames) rather than running full-frame detection
+        # and filtering after: measured 2026-07-10 at 3.9s -> 1.6s per frame
+        # (2.4x), since PaddleOCR's detector cost scales with image area and
+        # we only ever care about the bottom ~28% of the frame.
         self.ocr = PaddleOCR(
             lang=lang, enable_mkldnn=False,
             use_doc_orientation_classify=False,
             use_doc_unwarping=False,
             use_textline_orientation=False,
         )
-        self.overlay_top, self.overlay_bottom = overlay_band
+        self.overlay_band = overlay_band
+        # Prefix of every cache key: a result is only reused under the same
+        # OCR configuration that produced it
+        self._cache_salt = f"{OCR_CACHE_VERSION}|paddleocr-{version('paddleocr')}|{lang}|{OCR_MIN_SCORE}|".encode()
+        # (hash, result) of every crop OCR'd so far, for near-duplicate reuse
+        self._seen: list[tuple[np.ndarray, list[tuple[str, float]]]] = []
+        self.duplicate_hits = 0
+        self.cache_hits = 0
 
     def read(self, image_path: Path) -> list[tuple[str, float]]:
         """Return list of (text, score) found inside the overlay band."""
         try:
-            with Image.open(image_path) as img:
-                w, h = img.size
-                crop = img.crop((0, int(h * self.overlay_top), w, int(h * self.overlay_bottom)))
+            cache_key = hashlib.sha1(self._cache_salt + image_path.read_bytes()).hexdigest()
+            cache_path = OCR_CACHE_DIR / f"{cache_key}.json"
+            if cache_path.exists():
+                self.cache_hits += 1
+                return [tuple(item) for item in orjson.loads(cache_path.read_bytes())]
+            with Image.open(image_path) as crop:
+                crop_hash = overlay_hash(crop)
+                for seen_hash, seen_out in self._seen:
+                    if np.count_nonzero(seen_hash != crop_hash) <= OVERLAY_HASH_MAX_DISTANCE:
+                        self.duplicate_hits += 1
+                        return list(seen_out)
                 arr = np.array(crop.convert("RGB"))
             results = self.ocr.predict(arr)
         except Exception as e:
@@ -254,8 +344,11 @@ class OverlayReader:
             txts = r.get("rec_texts", [])
             scores = r.get("rec_scores", [])
             for text, score in zip(txts, scores):
-                if score >= 0.6:
+                if score >= OCR_MIN_SCORE:
                     out.append((text.strip(), float(score)))
+        self._seen.append((crop_hash, out))
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(orjson.dumps(out))
         return out
 
 
@@ -296,9 +389,9 @@ def looks_like_person_name(text: str) -> bool:
     # province/party half got read cleanly (e.g. "- RC", "Cotopaxi -",
     # "Nacional - Rc") — not a name. Found 2026-07-10 on a full session
     # where several of these got accepted as OOV "speaker" proposals.
-    if re.search(r"(^|\s)-(\s|$)", t):
+    if BANNER_DASH_RE.search(t):
         return False
-    words = [w for w in re.split(r"\s+", t) if w]
+    words = t.split()
     if len(words) < 2:
         return False
     # Real Spanish names are essentially never two bare 1-2 letter tokens
@@ -322,9 +415,23 @@ def looks_like_person_name(text: str) -> bool:
 # ---------------------------------------------------------------------------
 # Sampling timestamps per speaker
 # ---------------------------------------------------------------------------
+def group_segments_by_speaker(segments: list[dict]) -> dict[str, list[dict]]:
+    """{speaker_id: [segments]} in one pass, unlabeled segments dropped.
+
+    Replaces a per-speaker filter over the full segment list, which was
+    O(speakers × segments) — noticeable on plenaries with 60+ speakers and
+    tens of thousands of segments.
+    """
+    by_speaker: dict[str, list[dict]] = defaultdict(list)
+    for seg in segments:
+        spk_id = seg.get("speaker_id")
+        if spk_id:
+            by_speaker[spk_id].append(seg)
+    return by_speaker
+
+
 def sample_timestamps_for_speaker(
-    segments: list[dict],
-    speaker_id: str,
+    spk_segs: list[dict],
     n_segments: int,
     video_duration: float,
     frames_per_segment: int = 10,
@@ -348,13 +455,13 @@ def sample_timestamps_for_speaker(
         `frames_per_segment` per segment.
       - Stop once `max_total_frames` is reached across all segments, to keep
         OCR (CPU-bound) runtime bounded.
+
+    `spk_segs` is this speaker's segments only (see group_segments_by_speaker).
     """
-    spk_segs = [s for s in segments if s.get("speaker_id") == speaker_id]
     if not spk_segs:
         return []
 
-    spk_segs.sort(key=lambda s: s["end"] - s["start"], reverse=True)
-    chosen = spk_segs[:n_segments]
+    chosen = sorted(spk_segs, key=lambda s: s["end"] - s["start"], reverse=True)[:n_segments]
 
     timestamps: list[float] = []
     for seg in chosen:
@@ -386,13 +493,12 @@ def _canonicalize_oov(name: str) -> str:
     """Canonicalize an OOV OCR name for grouping: title-case, NFC-normalized,
     whitespace collapsed. Preserves Spanish accents (does NOT strip)."""
     nfc = unicodedata.normalize("NFC", name).strip()
-    nfc = re.sub(r"\s+", " ", nfc)
-    return nfc.title()
+    return " ".join(nfc.split()).title()
 
 
 def build_speaker_mapping(
     video_path: Path,
-    segments: list[dict],
+    segments_by_speaker: dict[str, list[dict]],
     reader: OverlayReader,
     lookup: dict[str, dict],
     frames_dir: Path,
@@ -412,132 +518,154 @@ def build_speaker_mapping(
     """
     frames_dir.mkdir(parents=True, exist_ok=True)
     duration = get_video_duration(video_path)
-    speaker_ids = sorted({s["speaker_id"] for s in segments if s.get("speaker_id")})
+    speaker_ids = sorted(segments_by_speaker)
     mapping: dict[str, dict] = {}
     oov_proposals: dict[str, dict] = {}
 
+    # Phase 1: plan every speaker's frames and queue all extractions up
+    # front. ffmpeg (I/O + decode) then runs in the background while the
+    # OCR loop below (CPU-bound) works through earlier speakers, instead of
+    # the two alternating and each idling while the other runs. With an
+    # early stop some frames go unread, but a frame grab is ~10x cheaper
+    # than OCR on it.
+    frame_plan: dict[str, list[tuple[float, Path]]] = {}
     for spk_id in speaker_ids:
-        print(f"\nSpeaker {spk_id}")
         timestamps = sample_timestamps_for_speaker(
-            segments, spk_id, samples_per_speaker, duration,
+            segments_by_speaker[spk_id], samples_per_speaker, duration,
             max_total_frames=max_frames_per_speaker,
         )
-        print(f"  sampling {len(timestamps)} frames")
-
-        # Each detection from each frame: (ts, raw_text, score, matched_canonical, similarity)
-        raw_detections: list[tuple[float, str, float, str | None, float]] = []
-        # Per-frame "best name" — one vote per frame to reduce noise from
-        # multiple overlay regions in the same frame.
-        # Tuple: (ts, db_name, db_score, oov_name, oov_score)
-        frame_votes: list[tuple[float, str | None, float, str | None, float]] = []
-        running_db_votes: Counter[str] = Counter()
-
-        for ts in timestamps:
-            frame_path = frames_dir / f"{spk_id}_{int(ts):06d}.jpg"
-            if not frame_path.exists() and not extract_frame(video_path, ts, frame_path):
-                continue
-            detections = reader.read(frame_path)
-
-            best_db_name, best_db_score = None, 0.0
-            best_oov_name, best_oov_score = None, 0.0
-            for text, score in detections:
-                if not looks_like_person_name(text):
+        frame_plan[spk_id] = [(ts, frames_dir / f"{spk_id}_{int(ts):06d}_overlay.jpg") for ts in timestamps]
+    with ThreadPoolExecutor(max_workers=EXTRACTION_WORKERS) as extraction_pool:
+        extractions = {}
+        for spk_id, frame_paths in frame_plan.items():
+            missing = {fp: ts for ts, fp in frame_paths if not fp.exists()}
+            extractions[spk_id] = extraction_pool.submit(
+                extract_frames, video_path, [(ts, fp) for fp, ts in missing.items()], reader.overlay_band,
+            )
+
+        # Phase 2: OCR, one speaker at a time, each waiting only for its own frames.
+        for spk_id in speaker_ids:
+            print(f"\nSpeaker {spk_id}")
+            frame_paths = frame_plan[spk_id]
+            print(f"  sampling {len(frame_paths)} frames")
+            try:
+                extractions[spk_id].result()
+            except subprocess.TimeoutExpired:
+                print("  frame extraction timed out", file=sys.stderr)
+
+            # Each detection from each frame: (ts, raw_text, score, matched_canonical, similarity)
+            raw_detections: list[tuple[float, str, float, str | None, float]] = []
+            # Per-frame "best name" — one vote per frame to reduce noise from
+            # multiple overlay regions in the same frame.
+            # Tuple: (ts, db_name, db_score, oov_name, oov_score)
+            frame_votes: list[tuple[float, str | None, float, str | None, float]] = []
+            running_db_votes: Counter[str] = Counter()
+
+            for ts, frame_path in frame_paths:
+                if not frame_path.exists():
                     continue
-                canonical, sim = match_name(text, lookup)
-                raw_detections.append((ts, text, score, canonical, sim))
-                if canonical and score > best_db_score:
-                    best_db_name, best_db_score = canonical, score
-                elif not canonical and score > best_oov_score:
-                    best_oov_name = _canonicalize_oov(text)
-                    best_oov_score = score
-            frame_votes.append((ts, best_db_name, best_db_score, best_oov_name, best_oov_score))
-
-            # Early stop: once a single DB name has EARLY_STOP_MIN_VOTES
-            # unanimous reads (no other DB name seen yet for this speaker),
-            # further frames are very unlikely to change the outcome — skip
-            # the rest of the budget. This is the common case for short
-            # clips with one dominant speaker; saves ~1.9s/frame of OCR for
-            # every frame skipped. Full budget still runs when reads
-            # disagree or nothing's found (genuinely ambiguous cases).
-            if best_db_name:
-                running_db_votes[best_db_name] += 1
-                if len(running_db_votes) == 1 and running_db_votes[best_db_name] >= EARLY_STOP_MIN_VOTES:
-                    print(f"  early stop: {best_db_name!r} confirmed by {running_db_votes[best_db_name]} unanimous reads")
-                    break
-
-        # Aggregate one vote per frame. DB match takes priority; if no DB match,
-        # accept OOV if its OCR score is high enough.
-        db_votes: Counter[str] = Counter()
-        oov_votes: Counter[str] = Counter()
-        oov_scores: dict[str, list[float]] = defaultdict(list)
-        for ts, db_name, db_score, oov_name, oov_score in frame_votes:
-            if db_name:
-                db_votes[db_name] += 1
-            elif oov_name and oov_score >= oov_min_ocr_score:
-                oov_votes[oov_name] += 1
-                oov_scores[oov_name].append(oov_score)
-
-        # Decide: DB match wins if it has enough agreement; otherwise consider OOV.
-        total_voting_frames = len([f for f in frame_votes if f[1] or f[3]])
-        chosen_name = None
-        chosen_conf = 0.0
-        source = None
-
-        if db_votes:
-            top_db, top_count = db_votes.most_common(1)[0]
-            db_conf = top_count / max(total_voting_frames, 1)
-            if db_conf >= confidence_threshold:
-                chosen_name = top_db
-                chosen_conf = db_conf
-                source = "db"
-
-        # Record ALL OOV detections as proposals (even if not chosen as mapping
-        # because of low count) — the user can review and approve them.
-        for oov_name, count in oov_votes.items():
-            prop = oov_proposals.setdefault(oov_name, {
-                "count": 0, "scores": [], "speakers": [],
-            })
-            prop["count"] += count
-            prop["scores"].extend(oov_scores[oov_name])
-            if spk_id not in prop["speakers"]:
-                prop["speakers"].append(spk_id)
-
-        if not chosen_name and oov_votes:
-            top_oov, top_count = oov_votes.most_common(1)[0]
-            oov_conf = top_count / max(total_voting_frames, 1)
-            if top_count >= oov_min_reads and oov_conf >= confidence_threshold:
-                chosen_name = top_oov
-                chosen_conf = oov_conf
-                source = "ocr-oov"
-
-        if chosen_name:
-            mapping[spk_id] = {
-                "name": chosen_name,
-                "confidence": round(chosen_conf, 2),
-                "votes": {**dict(db_votes), **{f"[OOV] {k}": v for k, v in oov_votes.items()}},
-                "samples": len(frame_votes),
-                "successful_reads": sum(db_votes.values()) + sum(oov_votes.values()),
-                "source": source,
-            }
-            tag = "" if source == "db" else "  [OOV — propose adding to DB]"
-            print(f"  → {chosen_name}  (conf={chosen_conf:.2f}, source={source}){tag}")
-        else:
-            mapping[spk_id] = {
-                "name": "No identificado",
-                "confidence": 0.0,
-                "votes": {**dict(db_votes), **{f"[OOV] {k}": v for k, v in oov_votes.items()}},
-                "samples": len(frame_votes),
-                "successful_reads": sum(db_votes.values()) + sum(oov_votes.values()),
-                "source": None,
-            }
-            if db_votes or oov_votes:
-                print(f"  → No identificado (votes={dict(db_votes)}, oov={dict(oov_votes)})")
+                detections = reader.read(frame_path)
+
+                best_db_name, best_db_score = None, 0.0
+                best_oov_name, best_oov_score = None, 0.0
+                for text, score in detections:
+                    if not looks_like_person_name(text):
+                        continue
+                    canonical, sim = match_name(text, lookup)
+                    raw_detections.append((ts, text, score, canonical, sim))
+                    if canonical and score > best_db_score:
+                        best_db_name, best_db_score = canonical, score
+                    elif not canonical and score > best_oov_score:
+                        best_oov_name = _canonicalize_oov(text)
+                        best_oov_score = score
+                frame_votes.append((ts, best_db_name, best_db_score, best_oov_name, best_oov_score))
+
+                # Early stop: once a single DB name has EARLY_STOP_MIN_VOTES
+                # unanimous reads (no other DB name seen yet for this speaker),
+                # further frames are very unlikely to change the outcome — skip
+                # the rest of the budget. This is the common case for short
+                # clips with one dominant speaker; saves ~1.9s/frame of OCR for
+                # every frame skipped. Full budget still runs when reads
+                # disagree or nothing's found (genuinely ambiguous cases).
+                if best_db_name:
+                    running_db_votes[best_db_name] += 1
+                    if len(running_db_votes) == 1 and running_db_votes[best_db_name] >= EARLY_STOP_MIN_VOTES:
+                        print(f"  early stop: {best_db_name!r} confirmed by {running_db_votes[best_db_name]} unanimous reads")
+                        break
+
+            # Aggregate one vote per frame. DB match takes priority; if no DB match,
+            # accept OOV if its OCR score is high enough.
+            db_votes: Counter[str] = Counter()
+            oov_votes: Counter[str] = Counter()
+            oov_scores: dict[str, list[float]] = defaultdict(list)
+            for ts, db_name, db_score, oov_name, oov_score in frame_votes:
+                if db_name:
+                    db_votes[db_name] += 1
+                elif oov_name and oov_score >= oov_min_ocr_score:
+                    oov_votes[oov_name] += 1
+                    oov_scores[oov_name].append(oov_score)
+
+            # Decide: DB match wins if it has enough agreement; otherwise consider OOV.
+            total_voting_frames = len([f for f in frame_votes if f[1] or f[3]])
+            chosen_name = None
+            chosen_conf = 0.0
+            source = None
+
+            if db_votes:
+                top_db, top_count = db_votes.most_common(1)[0]
+                db_conf = top_count / max(total_voting_frames, 1)
+                if db_conf >= confidence_threshold:
+                    chosen_name = top_db
+                    chosen_conf = db_conf
+                    source = "db"
+
+            # Record ALL OOV detections as proposals (even if not chosen as mapping
+            # because of low count) — the user can review and approve them.
+            for oov_name, count in oov_votes.items():
+                prop = oov_proposals.setdefault(oov_name, {
+                    "count": 0, "scores": [], "speakers": [],
+                })
+                prop["count"] += count
+                prop["scores"].extend(oov_scores[oov_name])
+                if spk_id not in prop["speakers"]:
+                    prop["speakers"].append(spk_id)
+
+            if not chosen_name and oov_votes:
+                top_oov, top_count = oov_votes.most_common(1)[0]
+                oov_conf = top_count / max(total_voting_frames, 1)
+                if top_count >= oov_min_reads and oov_conf >= confidence_threshold:
+                    chosen_name = top_oov
+                    chosen_conf = oov_conf
+                    source = "ocr-oov"
+
+            if chosen_name:
+                mapping[spk_id] = {
+                    "name": chosen_name,
+                    "confidence": round(chosen_conf, 2),
+                    "votes": {**dict(db_votes), **{f"[OOV] {k}": v for k, v in oov_votes.items()}},
+                    "samples": len(frame_votes),
+                    "successful_reads": sum(db_votes.values()) + sum(oov_votes.values()),
+                    "source": source,
+                }
+                tag = "" if source == "db" else "  [OOV — propose adding to DB]"
+                print(f"  → {chosen_name}  (conf={chosen_conf:.2f}, source={source}){tag}")
             else:
-                print(f"  → No identificado (no overlay detected in {len(frame_votes)} frames)")
-
-        # Debug log
-        for ts, text, score, canonical, sim in raw_detections[:3]:
-            print(f"    [{int(ts):5d}s] OCR={text!r} (s={score:.2f}) → {canonical} (sim={sim:.2f})")
+                mapping[spk_id] = {
+                    "name": "No identificado",
+                    "confidence": 0.0,
+                    "votes": {**dict(db_votes), **{f"[OOV] {k}": v for k, v in oov_votes.items()}},
+                    "samples": len(frame_votes),
+                    "successful_reads": sum(db_votes.values()) + sum(oov_votes.values()),
+                    "source": None,
+                }
+                if db_votes or oov_votes:
+                    print(f"  → No identificado (votes={dict(db_votes)}, oov={dict(oov_votes)})")
+                else:
+                    print(f"  → No identificado (no overlay detected in {len(frame_votes)} frames)")
+
+            # Debug log
+            for ts, text, score, canonical, sim in raw_detections[:3]:
+                print(f"    [{int(ts):5d}s] OCR={text!r} (s={score:.2f}) → {canonical} (sim={sim:.2f})")
 
     # Finalize OOV proposals
     final_oov = {}
@@ -552,9 +680,8 @@ def build_speaker_mapping(
     return mapping, final_oov
 
 
-def apply_mapping_to_session(session_path: Path, mapping: dict[str, dict], output_path: Path) -> None:
-    with open(session_path, encoding="utf-8") as f:
-        session = json.load(f)
+def apply_mapping_to_session(session: dict, mapping: dict[str, dict], output_path: Path) -> None:
+    """Stamp speaker names onto the already-loaded session and write it once."""
     for seg in session.get("segments", []):
         spk_id = seg.get("speaker_id")
         info = mapping.get(spk_id, {"name": "No identificado", "confidence": 0.0})
@@ -564,8 +691,7 @@ def apply_mapping_to_session(session_path: Path, mapping: dict[str, dict], outpu
             "confidence": info["confidence"],
         }
     session["speaker_mapping"] = mapping
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(session, f, ensure_ascii=False, indent=2)
+    output_path.write_bytes(orjson.dumps(session, option=orjson.OPT_INDENT_2))
 
 
 def main():
@@ -584,8 +710,7 @@ def main():
         print(f"ERROR: video not found at {video_path}", file=sys.stderr)
         return 1
 
-    with open(args.session_file, encoding="utf-8") as f:
-        session = json.load(f)
+    session = orjson.loads(Path(args.session_file).read_bytes())
     segments = session.get("segments", [])
     if not segments:
         print("ERROR: session has no segments", file=sys.stderr)
@@ -606,14 +731,15 @@ def main():
     # (found the hard way 2026-07-10: 23 speakers x 25 frames took ~90min of
     # CPU-bound OCR alone). Total budget is shared across speakers, clamped
     # to a sane per-speaker floor/ceiling.
-    n_speakers = len({s["speaker_id"] for s in segments if s.get("speaker_id")}) or 1
+    segments_by_speaker = group_segments_by_speaker(segments)
+    n_speakers = len(segments_by_speaker) or 1
     total_frame_budget = 150
     max_frames_per_speaker = max(5, min(25, total_frame_budget // n_speakers))
     print(f"{n_speakers} distinct speakers → up to {max_frames_per_speaker} OCR frames each")
 
     frames_dir = PROJECT_ROOT / "temp" / "frames" / args.video_id
     mapping, oov_proposals = build_speaker_mapping(
-        video_path, segments, reader, lookup, frames_dir,
+        video_path, segments_by_speaker, reader, lookup, frames_dir,
         samples_per_speaker=args.samples,
         confidence_threshold=args.threshold,
         max_frames_per_speaker=max_frames_per_speaker,
@@ -621,7 +747,7 @@ def main():
     apply_title_fallback(mapping, segments, args.title, lookup)
 
     output_path = Path(args.output) if args.output else Path(args.session_file)
-    apply_mapping_to_session(Path(args.session_file), mapping, output_path)
+    apply_mapping_to_session(session, mapping, output_path)
 
     # Persist OOV proposals to temp/ — these are review artifacts, not site data.
     if oov_proposals:
@@ -633,16 +759,20 @@ def main():
         print(f"✓ Wrote OOV proposals: {proposals_path}")
 
     print(f"\n✓ Wrote {output_path}")
+    if reader.duplicate_hits:
+        print(f"  OCR skipped on {reader.duplicate_hits} near-duplicate frame(s)")
+    if reader.cache_hits:
+        print(f"  OCR results reused from cache for {reader.cache_hits} frame(s)")
 
     # Summary
     print("\n=== Summary ===")
-    identified = sum(1 for m in mapping.values() if m["name"] != "No identificado")
-    db_hits = sum(1 for m in mapping.values() if m.get("source") == "db")
-    oov_hits = sum(1 for m in mapping.values() if m.get("source") == "ocr-oov")
-    print(f"  Identified: {identified}/{len(mapping)} speakers  (db={db_hits}, oov={oov_hits})")
+    identified = Counter(m["name"] != "No identificado" for m in mapping.values())[True]
+    sources = Counter(m.get("source") for m in mapping.values())
+    print(f"  Identified: {identified}/{len(mapping)} speakers  (db={sources['db']}, oov={sources['ocr-oov']})")
     for spk_id, info in mapping.items():
         src = info.get("source") or "—"
-        print(f"  {spk_id:12s}  {info['name']:30s}  conf={info['confidence']:.2f}  src={src}  reads={info['successful_reads']}")
+        n_segs = len(segments_by_speaker.get(spk_id, ()))
+        print(f"  {spk_id:12s}  {info['name']:30s}  conf={info['confidence']:.2f}  src={src}  reads={info['successful_reads']}  segments={n_segs}")
 
     if oov_proposals:
         print("\n=== OOV name proposals (not in DB, detected consistently) ===")
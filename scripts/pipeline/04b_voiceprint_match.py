@@ -32,6 +32,8 @@ import sys
 import unicodedata
 from pathlib import Path
 
+import orjson
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 VOICE_CLI = Path("/home/luis/proyectos/voice-detect.cpp/build/examples/cli/voicedetect-cli")
 VOICE_MODEL = Path("/home/luis/proyectos/voice-detect.cpp/models/wespeaker-resnet34-voxceleb.gguf")
@@ -131,7 +133,7 @@ def main() -> int:
     session_file = Path(args.session_file)
     db_path = Path(args.db_path)
 
-    session = json.loads(session_file.read_text(encoding="utf-8"))
+    session = orjson.loads(session_file.read_bytes())
     segments = session.get("segments", [])
     if not segments:
         return 0
@@ -212,7 +214,7 @@ def main() -> int:
             clip_path.unlink(missing_ok=True)
 
     save_db(db_path, db)
-    session_file.write_text(json.dumps(session, ensure_ascii=False, indent=2), encoding="utf-8")
+    session_file.write_bytes(orjson.dumps(session, option=orjson.OPT_INDENT_2))
     print(f"  voiceprint: enrolled {enrolled} cluster(s), matched {matched} previously-unidentified cluster(s) (db size={len(db)})")
     return 0
 
@@ -4,20 +4,85 @@
 
 Classifies session transcripts into topics using GPT-4o-mini.
 Extracts main topics, keywords, bills mentioned, and generates a summary.
+
+Accepts one transcript (--transcript-path) or many (--transcript-glob).
+Requests for many transcripts are sent concurrently through a single
+AsyncOpenAI client (HTTP/2, pooled connections), bounded by --concurrency
+and paced under the account's --max-rpm / --max-tpm limits, with
+exponential backoff on rate-limit and transient API errors.
+
+--mode batch submits the same requests through the OpenAI Batch API
+instead (half the price, no realtime rate limits, results within 24h) —
+meant for the offline re-classification of the whole archive.
+
+Results are cached in temp/cache/classify/, keyed per transcript and
+taxonomy (see classify_cache_key), so re-running over already-classified
+transcripts makes no API calls (--refresh bypasses the cache).
 """
 
 import os
 import sys
+import glob
 import json
 import yaml
+import time
+import random
+import hashlib
+import asyncio
 import argparse
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
-from openai import OpenAI
+import httpx
+from openai import (
+    AsyncOpenAI,
+    OpenAI,
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError,
+)
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.append(str(PROJECT_ROOT))
 
+import orjson
+
+from _common import dump_json, load_json
+
+# Concurrent in-flight requests when classifying many transcripts
+DEFAULT_CONCURRENCY = 10
+# Connections the async client keeps to the API. Over HTTP/2 the in-flight
+# requests multiplex on these instead of each needing its own TCP+TLS setup.
+HTTP_MAX_CONNECTIONS = 50
+HTTP_TIMEOUT = 60.0
+# Retries on 429 / 5xx / connection errors before giving up on a transcript
+MAX_RETRIES = 5
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+# Account rate limits the realtime requests are paced under (gpt-4o-mini,
+# tier 1); override in config.yml (openai.max_rpm / openai.max_tpm)
+DEFAULT_MAX_RPM = 500
+DEFAULT_MAX_TPM = 200000
+# Token estimates used to charge the TPM bucket before a request is sent
+CHARS_PER_TOKEN = 4
+COMPLETION_TOKENS_PER_RESULT = 400
+# Seconds between status checks while waiting on a Batch API job
+BATCH_POLL_INTERVAL = 30
+BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+# Transcript prefix sent to the model, in UTF-8 bytes. Cut on bytes rather
+# than characters so the prompt size doesn't depend on how many accented
+# characters the transcript happens to start with.
+TRANSCRIPT_PROMPT_BYTES = 4000
+CLASSIFY_CACHE_DIR = PROJECT_ROOT / "temp" / "cache" / "classify"
+# GPT-4o-mini pricing, USD per 1K tokens; the Batch API bills half
+INPUT_COST_PER_1K = 0.00015
+OUTPUT_COST_PER_1K = 0.0006
+BATCH_DISCOUNT = 0.5
+
+# Tokens actually billed this run, summed from each response's `usage`
+TOKEN_USAGE = Counter()
+
 
 def load_config():
     """Load configuration from config.yml"""
@@ -37,154 +102,537 @@ def load_topic_taxonomy():
         print(f"Error: Topic taxonomy not found: {taxonomy_path}")
         return None
 
-    with open(taxonomy_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_json(taxonomy_path)
 
 
 def load_transcript(transcript_path):
     """Load transcript JSON file"""
-    with open(transcript_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_json(transcript_path)
 
 
-def classify_topics(transcript_text, taxonomy, openai_api_key):
-    """
-    Classify transcript topics using GPT-4o-mini
+def transcript_excerpt(transcript_text):
+    """First TRANSCRIPT_PROMPT_BYTES bytes of the transcript, on a character boundary"""
+    return transcript_text.encode('utf-8')[:TRANSCRIPT_PROMPT_BYTES].decode('utf-8', errors='ignore')
 
-    Args:
-        transcript_text: Full transcript text
-        taxonomy: Topic taxonomy with categories
-        openai_api_key: OpenAI API key
 
-    Returns:
-        Dictionary with topics, keywords, bills, and summary
-    """
-    # Prepare topic categories for the prompt
-    categories_list = "\n".join([f"- {cat['name']}" for cat in taxonomy['categories']])
+SYSTEM_PROMPT = "Eres un asistente experto en análisis de sesiones legislativas de la Asamblea Nacional del Ecuador. Tu tarea es extraer temas, palabras clave, proyectos de ley mencionados y generar resúmenes concisos."
+
+
+def _category_names(taxonomy):
+    return tuple(cat['name'] for cat in taxonomy['categories'])
+
 
-    # Create prompt
-    prompt = f"""Analiza la siguiente transcripción de una sesión de la Asamblea Nacional del Ecuador y extrae la siguiente información:
+def build_instructions(taxonomy):
+    """Task description shared by single- and multi-transcript prompts"""
+    return _instructions(_category_names(taxonomy))
 
-1. TEMAS PRINCIPALES: Identifica 3-5 temas principales de los siguientes categories:
+
+# The static part of every prompt depends only on the taxonomy's category
+# names, so it is formatted once per taxonomy rather than once per transcript.
+@lru_cache(maxsize=4)
+def _instructions(category_names):
+    # Prepare topic categories for the prompt
+    categories_list = "\n".join([f"- {name}" for name in category_names])
+
+    return f"""1. TEMAS PRINCIPALES: Identifica 3-5 temas principales de los siguientes categories:
 {categories_list}
 
 2. PALABRAS CLAVE: Extrae 10-15 palabras clave o frases importantes.
 
 3. PROYECTOS DE LEY: Lista cualquier proyecto de ley o normativa mencionada (número y título si está disponible).
 
-4. RESUMEN: Escribe un resumen de 2-3 oraciones sobre lo discutido en la sesión.
+4. RESUMEN: Escribe un resumen de 2-3 oraciones sobre lo discutido en la sesión."""
+
+
+# Structured output: the model is constrained to exactly this shape, so
+# the prompt no longer has to describe it and responses always parse.
+CLASSIFICATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "topics": {"type": "array", "items": {"type": "string"}},
+        "keywords": {"type": "array", "items": {"type": "string"}},
+        "bills": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "number": {"type": "string"},
+                    "title": {"type": "string"},
+                },
+                "required": ["number", "title"],
+                "additionalProperties": False,
+            },
+        },
+        "summary": {"type": "string"},
+    },
+    "required": ["topics", "keywords", "bills", "summary"],
+    "additionalProperties": False,
+}
+
+# Multi-transcript answers (see classify_rows). Strict schemas can't have
+# free-form keys, so results come back as a list tagged with their id.
+MULTI_CLASSIFICATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    **CLASSIFICATION_SCHEMA["properties"],
+                },
+                "required": ["id", *CLASSIFICATION_SCHEMA["required"]],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["results"],
+    "additionalProperties": False,
+}
 
-Responde en formato JSON con esta estructura:
-{{
-  "topics": ["Topic 1", "Topic 2", ...],
-  "keywords": ["keyword1", "keyword2", ...],
-  "bills": [
-    {{"number": "PL-2026-001", "title": "Título del proyecto"}},
-    ...
-  ],
-  "summary": "Resumen de la sesión..."
-}}
+
+@lru_cache(maxsize=4)
+def _prompt_header(category_names):
+    return f"""Analiza la siguiente transcripción de una sesión de la Asamblea Nacional del Ecuador y extrae la siguiente información:
+
+{_instructions(category_names)}
 
 TRANSCRIPCIÓN:
-{transcript_text[:4000]}
-... [transcript truncated for API call]
 """
 
-    print("Calling GPT-4o-mini for topic classification...")
 
+def build_prompt(transcript_text, taxonomy):
+    """Build the user prompt for one transcript"""
+    return (
+        _prompt_header(_category_names(taxonomy))
+        + transcript_excerpt(transcript_text)
+        + "\n... [transcript truncated for API call]\n"
+    )
+
+
+def build_multi_prompt(rows, taxonomy):
+    """Build one user prompt covering several transcripts
+
+    Args:
+        rows: List of (row_id, transcript_text)
+        taxonomy: Topic taxonomy with categories
+    """
+    transcripts = "\n\n".join(
+        f"TRANSCRIPCIÓN [id={row_id}]:\n{transcript_excerpt(text)}\n... [transcript truncated for API call]"
+        for row_id, text in rows
+    )
+    return f"""Analiza cada una de las siguientes {len(rows)} transcripciones de sesiones de la Asamblea Nacional del Ecuador, por separado, y extrae para cada una la siguiente información:
+
+{build_instructions(taxonomy)}
+
+Devuelve en "results" un resultado por transcripción, con el id de la transcripción.
+
+{transcripts}
+"""
+
+
+def chat_request_body(prompt, schema=CLASSIFICATION_SCHEMA, schema_name="Classification"):
+    """Chat-completions request body for a user prompt, with a strict output schema"""
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "temperature": 0.3,
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {"name": schema_name, "schema": schema, "strict": True},
+        },
+    }
+
+
+def build_request_body(transcript_text, taxonomy):
+    """Chat-completions request body for one transcript"""
+    return chat_request_body(build_prompt(transcript_text, taxonomy))
+
+
+def classify_cache_key(transcript_text, taxonomy):
+    """Cache key for one transcript's labels under one taxonomy
+
+    A hash of the single-transcript request body (model, prompt, taxonomy,
+    excerpt), used as a stable per-transcript fingerprint. It names the
+    labels whichever request produced them — results from a multi-row
+    classify_rows call are stored under the same key — so it is not a hash
+    of the request actually sent. Changing the taxonomy categories, the
+    transcript prefix or the single-transcript prompt yields a new key;
+    changing only the multi-row prompt does not (use --refresh).
+    """
+    body = build_request_body(transcript_text, taxonomy)
+    return hashlib.sha256(orjson.dumps(body, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def classify_cache_get(key):
+    path = CLASSIFY_CACHE_DIR / f"{key}.json"
+    if not path.exists():
+        return None
     try:
-        client = OpenAI(api_key=openai_api_key)
-
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Eres un asistente experto en análisis de sesiones legislativas de la Asamblea Nacional del Ecuador. Tu tarea es extraer temas, palabras clave, proyectos de ley mencionados y generar resúmenes concisos."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.3,
-            response_format={"type": "json_object"}
-        )
+        return load_json(path)
+    except orjson.JSONDecodeError:
+        return None
 
+
+def classify_cache_put(key, result):
+    CLASSIFY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    dump_json(result, CLASSIFY_CACHE_DIR / f"{key}.json", pretty=False)
+
+
+class RateLimiter:
+    """
+    Token buckets for requests/minute and tokens/minute
+
+    The OpenAI Cookbook api_request_parallel_processor pattern: both buckets
+    start full and refill continuously at max_rpm/60 and max_tpm/60 per
+    second; a request waits until both hold enough capacity for it. A 429
+    halves the refill rate (throttle), each success wins back a little of it.
+    A limit of 0 disables that bucket.
+    """
+
+    MIN_RATE = 1 / 16
+    RECOVERY = 1.05
+
+    def __init__(self, max_rpm, max_tpm):
+        self.max_rpm = max_rpm
+        self.max_tpm = max_tpm
+        self.requests = float(max_rpm)
+        self.tokens = float(max_tpm)
+        self.rate = 1.0
+        self.updated = time.monotonic()
+        # Waiters are served in arrival order
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        credit = (now - self.updated) / 60 * self.rate
+        self.updated = now
+        self.requests = min(self.max_rpm, self.requests + self.max_rpm * credit)
+        self.tokens = min(self.max_tpm, self.tokens + self.max_tpm * credit)
+
+    async def acquire(self, tokens):
+        """Wait until one request and `tokens` tokens are available, then take them"""
+        tokens = min(tokens, self.max_tpm)  # a single oversized request must still go through
+        async with self.lock:
+            while True:
+                self._refill()
+                need_requests = 1 - self.requests if self.max_rpm else 0
+                need_tokens = tokens - self.tokens if self.max_tpm else 0
+                if need_requests <= 0 and need_tokens <= 0:
+                    break
+                waits = []
+                if need_requests > 0:
+                    waits.append(need_requests / (self.max_rpm * self.rate / 60))
+                if need_tokens > 0:
+                    waits.append(need_tokens / (self.max_tpm * self.rate / 60))
+                await asyncio.sleep(max(waits))
+            self.requests -= 1
+            self.tokens -= tokens
+
+    def throttle(self):
+        """Halve the refill rate (after a 429)"""
+        self.rate = max(self.MIN_RATE, self.rate / 2)
+
+    def recover(self):
+        """Creep the refill rate back towards the configured limits (after a success)"""
+        self.rate = min(1.0, self.rate * self.RECOVERY)
+
+
+def estimate_tokens(body, results=1):
+    """Rough prompt + completion token count of a request, for the TPM bucket"""
+    prompt_chars = sum(len(message['content']) for message in body['messages'])
+    return prompt_chars // CHARS_PER_TOKEN + COMPLETION_TOKENS_PER_RESULT * results
+
+
+async def create_with_retry(client, semaphore, name, body, limiter=None, results=1):
+    """Send one chat completion, retrying transient errors. Returns parsed JSON or None."""
+    tokens = estimate_tokens(body, results)
+    async with semaphore:
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                if limiter:
+                    await limiter.acquire(tokens)
+                response = await client.chat.completions.create(**body)
+                if limiter:
+                    limiter.recover()
+                break
+            except RETRYABLE_ERRORS as e:
+                if attempt == MAX_RETRIES:
+                    print(f"[{name}] Error during topic classification: {e}")
+                    return None
+                if limiter and isinstance(e, RateLimitError):
+                    limiter.throttle()
+                delay = min(60, 2 ** attempt) + random.uniform(0, 1)
+                print(f"[{name}] {type(e).__name__}, retrying in {delay:.1f}s ({attempt + 1}/{MAX_RETRIES})")
+                await asyncio.sleep(delay)
+            except Exception as e:
+                print(f"[{name}] Error during topic classification: {e}")
+                return None
+
+    record_usage(name, response.usage)
+
+    try:
         # Parse response
-        result = json.loads(response.choices[0].message.content)
+        return json.loads(response.choices[0].message.content)
+    except (json.JSONDecodeError, TypeError) as e:
+        print(f"[{name}] Could not parse classification response: {e}")
+        return None
+
+
+def token_cost(prompt_tokens, completion_tokens, discount=1.0):
+    """USD cost of a request from its token counts"""
+    return discount * (prompt_tokens * INPUT_COST_PER_1K + completion_tokens * OUTPUT_COST_PER_1K) / 1000
 
-        print("✓ Topic classification complete!")
-        print(f"  Topics: {len(result.get('topics', []))}")
-        print(f"  Keywords: {len(result.get('keywords', []))}")
-        print(f"  Bills mentioned: {len(result.get('bills', []))}")
 
-        # Estimate cost (GPT-4o-mini: ~$0.00015/1K input tokens, ~$0.0006/1K output tokens)
-        # Rough estimate: ~1000 input tokens, ~200 output tokens
-        cost = (1000 * 0.00015 / 1000) + (200 * 0.0006 / 1000)
-        print(f"  Estimated cost: ${cost:.6f}")
+def record_usage(name, usage, discount=1.0):
+    """Add a response's billed tokens to TOKEN_USAGE and log its cost"""
+    if usage is None:
+        return
+    prompt_tokens = getattr(usage, 'prompt_tokens', None)
+    if prompt_tokens is None:  # Batch API output lines carry usage as a plain dict
+        prompt_tokens, completion_tokens = usage.get('prompt_tokens', 0), usage.get('completion_tokens', 0)
+    else:
+        completion_tokens = usage.completion_tokens
+    cost = token_cost(prompt_tokens, completion_tokens, discount)
+    TOKEN_USAGE['prompt'] += prompt_tokens
+    TOKEN_USAGE['completion'] += completion_tokens
+    TOKEN_USAGE['cost_micro_usd'] += round(cost * 1e6)
+    print(f"[{name}] Tokens: {prompt_tokens} in / {completion_tokens} out (${cost:.6f})")
+
+
+def report_classification(name, result):
+    """Print a one-transcript summary line block"""
+    print(f"[{name}] ✓ Topic classification complete!")
+    print(f"  Topics: {len(result.get('topics', []))}")
+    print(f"  Keywords: {len(result.get('keywords', []))}")
+    print(f"  Bills mentioned: {len(result.get('bills', []))}")
+
+
+async def classify_one(client, semaphore, name, transcript_text, taxonomy, limiter=None):
+    """
+    Classify one transcript's topics using GPT-4o-mini
 
-        return result
+    Args:
+        client: Shared AsyncOpenAI client
+        semaphore: Bounds concurrent in-flight requests
+        name: Label used in log lines (transcript file stem)
+        transcript_text: Full transcript text
+        taxonomy: Topic taxonomy with categories
+        limiter: Optional RateLimiter shared by all requests
 
-    except Exception as e:
-        print(f"Error during topic classification: {e}")
+    Returns:
+        Dictionary with topics, keywords, bills, and summary, or None on failure
+    """
+    result = await create_with_retry(client, semaphore, name, build_request_body(transcript_text, taxonomy), limiter)
+    if not isinstance(result, dict):
         return None
+    report_classification(name, result)
+    return result
 
 
-def save_classified_transcript(data, output_path):
-    """Save classified transcript to JSON file"""
-    output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+async def classify_rows(client, semaphore, rows, taxonomy, limiter=None):
+    """
+    Classify several transcripts with a single request
+
+    The instructions and taxonomy are sent once for the whole group instead
+    of once per transcript. Any transcript missing from (or malformed in)
+    the combined answer is retried on its own.
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    Args:
+        client: Shared AsyncOpenAI client
+        semaphore: Bounds concurrent in-flight requests
+        rows: List of (name, transcript_text)
+        taxonomy: Topic taxonomy with categories
+        limiter: Optional RateLimiter shared by all requests
 
-    print(f"✓ Classified transcript saved to: {output_path}")
+    Returns:
+        List of classification dicts (or None), in the same order as rows
+    """
+    if len(rows) == 1:
+        name, text = rows[0]
+        return [await classify_one(client, semaphore, name, text, taxonomy, limiter)]
+
+    # Short positional ids keep the prompt small and can't collide
+    ids = [f"t{i + 1}" for i in range(len(rows))]
+    label = f"{rows[0][0]}..{rows[-1][0]}"
+    body = chat_request_body(
+        build_multi_prompt([(row_id, text) for row_id, (_, text) in zip(ids, rows)], taxonomy),
+        schema=MULTI_CLASSIFICATION_SCHEMA,
+        schema_name="Classifications",
+    )
+    combined = await create_with_retry(client, semaphore, label, body, limiter, results=len(rows))
+    by_id = {}
+    for item in (combined or {}).get('results', []):
+        row_id = item.pop('id', None)
+        by_id.setdefault(row_id, item)
+
+    results = []
+    for row_id, (name, text) in zip(ids, rows):
+        result = by_id.get(row_id)
+        if result is not None:
+            report_classification(name, result)
+            results.append(result)
+        else:
+            results.append(None)
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        print(f"[{label}] {len(missing)} transcript(s) missing from combined answer, retrying individually")
+        retried = await asyncio.gather(*[
+            classify_one(client, semaphore, rows[i][0], rows[i][1], taxonomy, limiter) for i in missing
+        ])
+        for i, result in zip(missing, retried):
+            results[i] = result
+    return results
+
+
+async def classify_many(transcripts, taxonomy, openai_api_key, concurrency=DEFAULT_CONCURRENCY, rows_per_call=1,
+                        max_rpm=DEFAULT_MAX_RPM, max_tpm=DEFAULT_MAX_TPM):
+    """
+    Classify many transcripts concurrently through one client
 
+    Args:
+        transcripts: List of (name, transcript_text)
+        taxonomy: Topic taxonomy with categories
+        openai_api_key: OpenAI API key
+        concurrency: Max requests in flight at once
+        rows_per_call: Transcripts packed into each request (see classify_rows)
+        max_rpm: Requests/minute to stay under (0 = unlimited)
+        max_tpm: Tokens/minute to stay under (0 = unlimited)
 
-def main():
-    """Main function"""
-    parser = argparse.ArgumentParser(description='Classify topics in transcript using GPT-4o-mini')
-    parser.add_argument('--transcript-path', required=True, help='Path to transcript JSON file')
-    parser.add_argument('--output-path', help='Output JSON file path')
+    Returns:
+        List of classification dicts (or None), in the same order as transcripts
+    """
+    print(f"Calling GPT-4o-mini for topic classification ({len(transcripts)} transcript(s), {concurrency} in flight)...")
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(max_rpm, max_tpm) if max_rpm or max_tpm else None
+    groups = [transcripts[i:i + rows_per_call] for i in range(0, len(transcripts), rows_per_call)]
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS),
+        timeout=HTTP_TIMEOUT,
+    )
+    # AsyncOpenAI closes http_client on exit
+    async with AsyncOpenAI(api_key=openai_api_key, http_client=http_client) as client:
+        grouped = await asyncio.gather(*[
+            classify_rows(client, semaphore, group, taxonomy, limiter) for group in groups
+        ])
+    return [result for group in grouped for result in group]
 
-    args = parser.parse_args()
 
-    print("="*60)
-    print("05_CLASSIFY_TOPICS - Topic Classification with GPT-4o-mini")
-    print("="*60)
+@lru_cache(maxsize=1)
+def openai_client(openai_api_key):
+    """Synchronous client, built once per process (it owns the HTTP connection pool)"""
+    return OpenAI(api_key=openai_api_key)
 
-    # Load configuration
-    config = load_config()
-    openai_api_key = config['openai']['api_key']
 
-    # Load topic taxonomy
-    print("Loading topic taxonomy...")
-    taxonomy = load_topic_taxonomy()
-    if not taxonomy:
-        return 1
+def classify_with_batch_api(transcripts, taxonomy, openai_api_key, poll_interval=BATCH_POLL_INTERVAL):
+    """
+    Classify many transcripts through the OpenAI Batch API
 
-    print(f"✓ Loaded {len(taxonomy['categories'])} topic categories")
+    Uploads one JSONL line per transcript, submits a batch job, polls it
+    until it finishes and demuxes the output by custom_id.
 
-    # Load transcript
-    print(f"Loading transcript from {args.transcript_path}...")
-    transcript_data = load_transcript(args.transcript_path)
+    Args:
+        transcripts: List of (name, transcript_text); names must be unique
+        taxonomy: Topic taxonomy with categories
+        openai_api_key: OpenAI API key
+        poll_interval: Seconds between status checks
 
-    # Classify topics
-    classification = classify_topics(
-        transcript_data.get('text', ''),
-        taxonomy,
-        openai_api_key
+    Returns:
+        List of classification dicts (or None), in the same order as transcripts
+    """
+    client = openai_client(openai_api_key)
+
+    lines = [
+        json.dumps({
+            "custom_id": name,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": build_request_body(text, taxonomy),
+        }, ensure_ascii=False)
+        for name, text in transcripts
+    ]
+    batch_input = ("\n".join(lines) + "\n").encode("utf-8")
+
+    print(f"Uploading batch input ({len(lines)} request(s), {len(batch_input) / 1024:.0f} KB)...")
+    input_file = client.files.create(file=("classify_topics.jsonl", batch_input), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
     )
+    print(f"✓ Submitted batch {batch.id}")
+
+    while batch.status not in BATCH_TERMINAL_STATUSES:
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+        counts = batch.request_counts
+        done = f" ({counts.completed}/{counts.total} done, {counts.failed} failed)" if counts else ""
+        print(f"  batch {batch.id}: {batch.status}{done}")
+
+    if batch.status != "completed" or not batch.output_file_id:
+        print(f"Error: batch {batch.id} ended with status '{batch.status}'")
+        return [None] * len(transcripts)
+
+    results = {}
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        name = item.get("custom_id")
+        response = item.get("response") or {}
+        if item.get("error") or response.get("status_code") != 200:
+            print(f"[{name}] Error during topic classification: {item.get('error') or response.get('body')}")
+            continue
+        try:
+            record_usage(name, response["body"].get("usage"), discount=BATCH_DISCOUNT)
+            results[name] = json.loads(response["body"]["choices"][0]["message"]["content"])
+        except (KeyError, IndexError, TypeError, json.JSONDecodeError) as e:
+            print(f"[{name}] Could not parse classification response: {e}")
+
+    print(f"✓ Batch complete: {len(results)}/{len(transcripts)} classified")
+    return [results.get(name) for name, _ in transcripts]
+
+
+def classify_topics(transcript_text, taxonomy, openai_api_key):
+    """
+    Classify transcript topics using GPT-4o-mini
+
+    Args:
+        transcript_text: Full transcript text
+        taxonomy: Topic taxonomy with categories
+        openai_api_key: OpenAI API key
+
+    Returns:
+        Dictionary with topics, keywords, bills, and summary
+    """
+    return asyncio.run(classify_many([("transcript", transcript_text)], taxonomy, openai_api_key))[0]
 
-    if not classification:
-        return 1
 
-    # Update transcript data
-    result = transcript_data.copy()
-    result['classification'] = classification
+def save_classified_transcript(data, *output_paths):
+    """Save classified transcript to one or more JSON files (encoded once)"""
+    payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    for output_path in output_paths:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(payload)
 
-    # Print results
+        print(f"✓ Classified transcript saved to: {output_path}")
+
+
+def print_classification(classification):
+    """Print a classification result"""
     print("\nClassification Results:")
     print("-" * 60)
 
@@ -206,21 +654,151 @@ def main():
 
     print("-" * 60)
 
-    # Determine output path
-    if args.output_path:
-        output_path = args.output_path
+
+def default_output_path(transcript_path):
+    """temp/classified/<stem>_classified.json"""
+    transcript_filename = Path(transcript_path).stem
+    return PROJECT_ROOT / "temp" / "classified" / f"{transcript_filename}_classified.json"
+
+
+def main(argv=None):
+    """Main function (argv: argument list, default sys.argv[1:])"""
+    parser = argparse.ArgumentParser(description='Classify topics in transcript using GPT-4o-mini')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--transcript-path', help='Path to transcript JSON file')
+    source.add_argument('--transcript-glob', help='Glob of transcript JSON files, e.g. "data/sessions/*.json"')
+    parser.add_argument('--output-path', help='Output JSON file path (single transcript only)')
+    parser.add_argument('--video-id',
+                        help='Add id / video_id / source_url for this YouTube video to the output (single transcript only)')
+    parser.add_argument('--session-out-path',
+                        help='Also write the result as the session file, e.g. data/sessions/<id>.json '
+                             '(single transcript only; skips the temp/classified/ copy unless --output-path is given)')
+    parser.add_argument('--mode', choices=['realtime', 'batch'], default='realtime',
+                        help='realtime: concurrent chat completions (default). '
+                             'batch: OpenAI Batch API — 50%% cheaper, completes within 24h')
+    parser.add_argument('--rows-per-call', type=int, default=1,
+                        help='Transcripts packed into one realtime request (default: 1). '
+                             '4-8 amortizes the shared instructions; larger gets slower per call')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Ignore cached classifications and call the API again')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Max concurrent API requests in realtime mode (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--max-rpm', type=int,
+                        help=f'Requests/minute limit in realtime mode, 0 = unlimited '
+                             f'(default: openai.max_rpm in config.yml, else {DEFAULT_MAX_RPM})')
+    parser.add_argument('--max-tpm', type=int,
+                        help=f'Tokens/minute limit in realtime mode, 0 = unlimited '
+                             f'(default: openai.max_tpm in config.yml, else {DEFAULT_MAX_TPM})')
+
+    args = parser.parse_args(argv)
+
+    if args.mode == 'batch' and args.rows_per_call > 1:
+        parser.error('--rows-per-call only applies to --mode realtime')
+    if args.transcript_glob and (args.output_path or args.video_id or args.session_out_path):
+        parser.error('--output-path, --video-id and --session-out-path only apply to --transcript-path; '
+                     'with --transcript-glob results go to temp/classified/')
+
+    print("="*60)
+    print("05_CLASSIFY_TOPICS - Topic Classification with GPT-4o-mini")
+    print("="*60)
+
+    # Load configuration
+    config = load_config()
+    openai_api_key = config['openai']['api_key']
+    max_rpm = args.max_rpm if args.max_rpm is not None else config['openai'].get('max_rpm', DEFAULT_MAX_RPM)
+    max_tpm = args.max_tpm if args.max_tpm is not None else config['openai'].get('max_tpm', DEFAULT_MAX_TPM)
+
+    # Load topic taxonomy
+    print("Loading topic taxonomy...")
+    taxonomy = load_topic_taxonomy()
+    if not taxonomy:
+        return 1
+
+    print(f"✓ Loaded {len(taxonomy['categories'])} topic categories")
+
+    # Load transcripts
+    if args.transcript_glob:
+        transcript_paths = [
+            Path(p) for p in sorted(glob.glob(args.transcript_glob, recursive=True))
+            if Path(p).name != "index.json"
+        ]
+        if not transcript_paths:
+            print(f"No transcripts match {args.transcript_glob}")
+            return 1
     else:
-        transcript_filename = Path(args.transcript_path).stem
-        output_path = PROJECT_ROOT / "temp" / "classified" / f"{transcript_filename}_classified.json"
+        transcript_paths = [Path(args.transcript_path)]
 
-    # Save result
-    save_classified_transcript(result, output_path)
+    print(f"Loading {len(transcript_paths)} transcript(s)...")
+    transcripts = [(path, load_transcript(path)) for path in transcript_paths]
+
+    # Serve unchanged transcripts from the cache
+    named_texts = [(path.stem, data.get('text', '')) for path, data in transcripts]
+    cache_keys = [classify_cache_key(text, taxonomy) for _, text in named_texts]
+    classifications = [None if args.refresh else classify_cache_get(key) for key in cache_keys]
+    pending = [i for i, classification in enumerate(classifications) if classification is None]
+    if len(pending) < len(named_texts):
+        print(f"✓ {len(named_texts) - len(pending)} transcript(s) served from cache")
+
+    # Classify topics
+    pending_texts = [named_texts[i] for i in pending]
+    if not pending_texts:
+        results = []
+    elif args.mode == 'batch':
+        if len({name for name, _ in pending_texts}) != len(pending_texts):
+            print("Error: batch mode needs unique transcript file names (used as custom_id)")
+            return 1
+        results = classify_with_batch_api(pending_texts, taxonomy, openai_api_key)
+    else:
+        results = asyncio.run(classify_many(
+            pending_texts,
+            taxonomy,
+            openai_api_key,
+            concurrency=args.concurrency,
+            rows_per_call=max(1, args.rows_per_call),
+            max_rpm=max_rpm,
+            max_tpm=max_tpm,
+        ))
+
+    for i, result in zip(pending, results):
+        classifications[i] = result
+        if result:
+            classify_cache_put(cache_keys[i], result)
+
+    failed = 0
+    for (path, transcript_data), classification in zip(transcripts, classifications):
+        if not classification:
+            failed += 1
+            continue
+
+        # Update transcript data
+        result = transcript_data.copy()
+        result['classification'] = classification
+        if args.video_id:
+            result['id'] = args.video_id
+            result['video_id'] = args.video_id
+            result['source_url'] = f"https://www.youtube.com/watch?v={args.video_id}"
+
+        if len(transcripts) == 1:
+            print_classification(classification)
+
+        # Determine output paths
+        output_paths = []
+        if args.session_out_path:
+            output_paths.append(args.session_out_path)
+        if args.output_path or not args.session_out_path:
+            output_paths.append(args.output_path or default_output_path(path))
+
+        # Save result
+        save_classified_transcript(result, *output_paths)
 
     print("\n" + "="*60)
-    print(f"COMPLETE - Classified transcript saved to: {output_path}")
+    print(f"COMPLETE - {len(transcripts) - failed}/{len(transcripts)} transcript(s) classified")
+    if TOKEN_USAGE:
+        print(f"Tokens: {TOKEN_USAGE['prompt']} in / {TOKEN_USAGE['completion']} out, "
+              f"cost: ${TOKEN_USAGE['cost_micro_usd'] / 1e6:.6f}")
     print("="*60)
 
-    return 0
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+_common.py
+
+Helpers shared by the classification and aggregation steps
+(05_classify_topics.py, aggregate.py): session loading and JSON I/O.
+
+Imported as a sibling module (`from _common import ...`): the pipeline
+scripts are run directly, so scripts/pipeline/ is already on sys.path.
+"""
+
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import orjson
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+SESSIONS_DIR = PROJECT_ROOT / "data" / "sessions"
+
+# Parallel readers for load_all_sessions. Loading is mostly open/read
+# syscalls on ~1k files, which release the GIL, so threads overlap the I/O.
+LOAD_WORKERS = 16
+
+# Per-segment payload that no aggregation step reads. `segments` alone is
+# ~90% of a session file; dropping it right after parsing keeps only the
+# session-level metadata resident instead of the whole archive's segments.
+PER_SEGMENT_FIELDS = ("segments", "speaker_mapping")
+
+# Projected sessions from the previous run, keyed by file path and validated
+# by (mtime_ns, size): only new or changed session files get re-parsed.
+# One file per text_limit, since the projection depends on it. Under temp/,
+# not data/ — data/ is mirrored to docs/.
+SESSIONS_CACHE_DIR = PROJECT_ROOT / "temp" / "cache" / "sessions"
+
+
+def load_json(path):
+    """Parse a JSON file (orjson: ~2-3x faster than json.load)"""
+    return orjson.loads(Path(path).read_bytes())
+
+
+def dump_json(data, path, pretty=True):
+    """Write JSON as UTF-8.
+
+    pretty: 2-space indent, byte-for-byte the same layout as
+    json.dump(indent=2, ensure_ascii=False). Otherwise compact — for files
+    only machines read, where indentation roughly doubles the size.
+    """
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+    Path(path).write_bytes(orjson.dumps(data, option=option))
+
+
+def project_session(data, text_limit=0):
+    """Strip a parsed session down to what the aggregation steps use.
+
+    Drops PER_SEGMENT_FIELDS and truncates `text` to `text_limit` chars
+    (0 drops it entirely).
+    """
+    for field in PER_SEGMENT_FIELDS:
+        data.pop(field, None)
+    if text_limit:
+        if 'text' in data:
+            data['text'] = data['text'][:text_limit]
+    else:
+        data.pop('text', None)
+    return data
+
+
+def dump_json_stream(path, head, list_key, items, pretty=True):
+    """Write {**head, list_key: [*items]} one item at a time.
+
+    Same bytes as dump_json on the equivalent dict, but never holds the
+    whole serialized document (or, given a generator, the whole list) in
+    memory. `list_key` is written last. Returns the number of items written.
+    """
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        # JSON strings can't contain raw newlines, so re-indenting a nested
+        # value is a plain byte replace.
+        open_obj, key_sep, field_end, open_list = b'{\n  ', b': ', b',\n  ', b'['
+        first_item, next_item, close_list, close_obj = b'\n    ', b',\n    ', b'\n  ]', b'\n}'
+        nest = lambda raw, depth: raw.replace(b'\n', b'\n' + b'  ' * depth)
+    else:
+        open_obj, key_sep, field_end, open_list = b'{', b':', b',', b'['
+        first_item, next_item, close_list, close_obj = b'', b',', b']', b'}'
+        nest = lambda raw, depth: raw
+
+    with open(path, 'wb') as f:
+        f.write(open_obj)
+        for key, value in head.items():
+            f.write(orjson.dumps(key) + key_sep + nest(orjson.dumps(value, option=option), 1) + field_end)
+        f.write(orjson.dumps(list_key) + key_sep + open_list)
+        count = 0
+        for item in items:
+            f.write(next_item if count else first_item)
+            f.write(nest(orjson.dumps(item, option=option), 2))
+            count += 1
+        f.write((close_list if count else b']') + close_obj)
+    return count
+
+
+def _load_one(session_file, text_limit=0):
+    """Read and project one session file. Returns (path, data), or None if unreadable."""
+    try:
+        return session_file, project_session(load_json(session_file), text_limit)
+    except Exception as e:
+        print(f"Warning: Could not load {session_file}: {e}")
+        return None
+
+
+def _read_sessions_cache(cache_path):
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Warning: Ignoring unreadable sessions cache {cache_path}: {e}")
+        return {}
+
+
+def _write_sessions_cache(cache_path, entries):
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(cache_path)
+
+
+def load_all_sessions(with_paths=False, text_limit=0, workers=LOAD_WORKERS, use_cache=True):
+    """
+    Load all session files from data/sessions (projected, see project_session)
+
+    With use_cache, files whose (mtime, size) match the previous run are
+    served from SESSIONS_CACHE_DIR instead of being re-read and re-parsed.
+
+    Args:
+        with_paths: If True, return [{'file_path': <relative to repo>, 'data': session}]
+                    instead of bare session dicts
+        text_limit: Keep the first N chars of the transcript `text` (0 = drop it)
+        workers: Concurrent file readers
+        use_cache: Reuse unchanged sessions from the previous run
+
+    Returns:
+        List of sessions, in rglob order (same order as a sequential walk)
+    """
+    if not SESSIONS_DIR.exists():
+        print(f"Warning: Sessions directory not found: {SESSIONS_DIR}")
+        return []
+
+    # Recursively find all JSON files in sessions directory
+    paths = [p for p in SESSIONS_DIR.rglob("*.json") if p.name != "index.json"]
+
+    cache_path = SESSIONS_CACHE_DIR / f"text-{text_limit}.pickle"
+    cached = _read_sessions_cache(cache_path) if use_cache else {}
+    signatures = {}
+    for path in paths:
+        st = path.stat()
+        signatures[path] = (st.st_mtime_ns, st.st_size)
+
+    fresh = {}
+    stale = []
+    for path in paths:
+        hit = cached.get(str(path))
+        if hit and hit[0] == signatures[path]:
+            fresh[path] = hit[1]
+        else:
+            stale.append(path)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for item in pool.map(lambda p: _load_one(p, text_limit), stale):
+            if item is not None:
+                fresh[item[0]] = item[1]
+
+    if use_cache and (stale or len(cached) != len(fresh)):
+        _write_sessions_cache(cache_path, {
+            str(path): (signatures[path], data) for path, data in fresh.items()
+        })
+
+    loaded = [(path, fresh[path]) for path in paths if path in fresh]
+
+    if with_paths:
+        return [
+            {'file_path': str(path.relative_to(PROJECT_ROOT)), 'data': data}
+            for path, data in loaded
+        ]
+    return [data for _, data in loaded]
@@ -0,0 +1,930 @@
+#!/usr/bin/env python3
+"""
+aggregate.py
+
+Builds every site-data artifact from one load of the sessions:
+
+- data/stats/all-time.json         (speaker, topic and monthly stats; 06)
+- data/search/index.json           (search index; 07)
+- data/catalog.json                (session catalog; 08)
+- data/topics/topic-sessions.json  (topic-to-session mapping; 08)
+
+06_generate_stats.py, 07_build_search_index.py and 08_update_catalog.py
+each used to load and parse the whole session archive on their own; they
+are now thin CLIs over run() with a single --emit target. Running this
+script directly emits everything for the cost of one load. Emitting the
+catalog also mirrors data/ to docs/data/ (see sync_docs_data).
+"""
+
+import os
+import sys
+import gzip
+import argparse
+import filecmp
+import shutil
+import unicodedata
+from pathlib import Path
+from datetime import datetime
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+import orjson
+
+from _common import dump_json, dump_json_stream, load_all_sessions, load_json
+
+EMIT_TARGETS = ('stats', 'search', 'catalog', 'topics')
+
+# Transcript prefix loaded per session for the index (see load_all_sessions)
+TRANSCRIPT_INDEX_CHARS = 5000
+# Cap on the indexed transcript, in UTF-8 bytes after normalization, so each
+# document's payload is bounded regardless of how many accented chars it has
+TRANSCRIPT_INDEX_BYTES = 4096
+
+# --shards layout: shard name -> document fields it carries (plus 'id')
+SHARD_FIELDS = {
+    'meta': ('title', 'date', 'url', 'duration'),
+    'speakers': ('speakers',),
+    'topics': ('topics', 'keywords', 'summary'),
+    'transcript': ('transcript',),
+}
+
+
+# ---------------------------------------------------------------------------
+# Statistics (06)
+# ---------------------------------------------------------------------------
+
+def _norm_name(s):
+    import unicodedata, re
+    nfkd = unicodedata.normalize('NFKD', s)
+    cleaned = ''.join(c for c in nfkd if not unicodedata.combining(c)).lower()
+    return re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', ' ', cleaned)).strip()
+
+
+def _load_speakers_db():
+    """Load the canonical speakers DB and return a {normalized_name: entry} map."""
+    db_path = PROJECT_ROOT / 'data' / 'speakers' / 'asambleistas.json'
+    if not db_path.exists():
+        return {}
+    data = load_json(db_path)
+    lookup = {}
+    for entry in data.get('asambleistas', []):
+        keys = [entry.get('name', '')] + list(entry.get('alternate_names') or [])
+        for k in keys:
+            if k:
+                lookup[_norm_name(k)] = entry
+    return lookup
+
+
+def _match_speaker(name: str, db_lookup: dict) -> dict | None:
+    """Look up a speaker in the DB. Tries exact, then surname-token match.
+
+    Surname-token: a long OCR'd name like "Adrián Ernesto Castro Piedra" is
+    matched to the DB entry "Adrián Castro" if the *first and last* tokens
+    of the OCR name match the first and last of the DB entry (handles both
+    legal-name padding in the middle and family-name suffix dropping).
+    """
+    key = _norm_name(name)
+    if not key:
+        return None
+    if key in db_lookup:
+        return db_lookup[key]
+    cand_tokens = key.split()
+    if len(cand_tokens) < 2:
+        return None
+    cand_first, cand_last = cand_tokens[0], cand_tokens[-1]
+    best = None
+    for db_key, entry in db_lookup.items():
+        db_tokens = db_key.split()
+        if len(db_tokens) < 2:
+            continue
+        db_first, db_last = db_tokens[0], db_tokens[-1]
+        # Both first+last match, or both names contain the same first+last pair
+        if cand_first == db_first and (
+            cand_last == db_last
+            or db_last in cand_tokens
+            or cand_last in db_tokens
+        ):
+            best = entry
+            break
+    return best
+
+
+# Tokens that PaddleOCR sometimes picks up from the lower-third banner but
+# that are not personal names. They are *not* speakers and must not appear
+# in the aggregated stats.
+_BANNER_NOISE = {
+    'asambleista nacional', 'asamblea nacional',
+    'comision general', 'pleno asamblea',
+    'pichincha adn', 'guayas adn',
+    'comps cordova',  # consistent OCR garble — review separately
+}
+def _is_banner_noise(name: str) -> bool:
+    n = _norm_name(name)
+    if not n:
+        return True
+    if n in _BANNER_NOISE:
+        return True
+    # Province + " - " + party patterns ("Pichincha - ADN")
+    import re
+    if re.fullmatch(r'[a-z]+\s*[a-z]+', n) and any(prov in n for prov in [
+        'pichincha', 'guayas', 'azuay', 'manabi', 'tungurahua', 'imbabura', 'loja', 'cotopaxi'
+    ]):
+        return True
+    return False
+
+
+def _month_key(date_str):
+    """'YYYY-MM' for an ISO 8601 date string.
+
+    Session dates are ISO 8601 ('2026-06-17T00:00:00Z'), so the month is
+    just the first 7 chars — no need to build a datetime per session.
+    Anything else goes through fromisoformat (which raises on garbage).
+    """
+    if len(date_str) >= 7 and date_str[4] == '-' and date_str[:4].isdigit() and date_str[5:7].isdigit():
+        return date_str[:7]
+    return datetime.fromisoformat(date_str.replace('Z', '+00:00')).strftime('%Y-%m')
+
+
+def tally_all_stats(sessions):
+    """Pass sessions through while tallying generate_all_stats' statistics.
+
+    A generator: yields each session back unchanged and, once `sessions` is
+    exhausted, returns (speaker_stats, topic_stats, monthly_stats) — so other
+    builders can share the same pass with `stats = yield from ...`.
+
+    Each session's `id`, `speaker_stats`, `classification.topics` and `date`
+    are looked up once and feed all three accumulators, instead of three
+    separate walks over every session.
+
+    Speaker stats aggregate by NAME (not speaker_id) because diarization
+    speaker_ids are local to a session — speaker_0 in session A is not
+    speaker_0 in session B. Each aggregated entry is joined with the
+    canonical speakers DB to surface `type` (asambleísta | comparecencia |
+    prensa | otro), party, province, and role.
+
+    Returns:
+        (speaker_stats, topic_stats, monthly_stats)
+    """
+    db = _load_speakers_db()
+
+    # Flat counters + per-key sets, allocated on first sight, instead of
+    # defaultdict(lambda: {...}) building a dict and 2 sets for every new key.
+    # Dicts/Counters keep first-seen order, so sort ties come out as before.
+    speaker_names = {}
+    speaker_canonical = {}
+    speaker_time = Counter()
+    speaker_interventions = Counter()
+    speaker_sessions = {}
+    speaker_topics = {}
+
+    topic_count = Counter()
+    topic_sessions = {}
+
+    month_sessions = Counter()
+    month_duration = Counter()
+    month_speakers = {}
+    month_topics = {}
+
+    for session in sessions:
+        # Hand the session on first: the tallies below only read it
+        yield session
+
+        # Every per-session field is looked up once, here
+        get = session.get
+        session_id = get('id', 'unknown')
+        speakers = get('speaker_stats') or ()
+        topics = (get('classification') or {}).get('topics') or ()
+        date_str = get('date', '')
+
+        # Speakers
+        for speaker in speakers:
+            name = speaker.get('name')
+            if not name or name == 'No identificado':
+                continue
+            if _is_banner_noise(name):
+                continue
+            # Use the canonical DB name as aggregation key when we can match,
+            # so the long OCR name and the short DB name aggregate together.
+            canonical = _match_speaker(name, db)
+            key = _norm_name(canonical['name']) if canonical else _norm_name(name)
+            speaker_names[key] = (canonical or {}).get('name') or speaker_names.get(key) or name
+            speaker_canonical[key] = canonical
+            speaker_time[key] += speaker.get('total_time', 0)
+            speaker_interventions[key] += speaker.get('interventions', 0)
+            attended = speaker_sessions.get(key)
+            if attended is None:
+                speaker_sessions[key] = attended = set()
+                speaker_topics[key] = set()
+            attended.add(session_id)
+            speaker_topics[key].update(topics)
+
+        # Topics
+        if topics:
+            topic_ref = {
+                'id': session_id,
+                'title': get('title', ''),
+                'date': date_str
+            }
+            topic_count.update(topics)
+            for topic in topics:
+                refs = topic_sessions.get(topic)
+                if refs is None:
+                    topic_sessions[topic] = refs = []
+                refs.append(dict(topic_ref))
+
+        # Months
+        if not date_str:
+            continue
+
+        try:
+            month_key = _month_key(date_str)
+            month_sessions[month_key] += 1
+            month_duration[month_key] += get('duration', 0)
+            if month_key not in month_speakers:
+                month_speakers[month_key] = set()
+                month_topics[month_key] = set()
+
+            # Count unique speakers
+            for speaker in speakers:
+                if speaker['id'] != 'UNIDENTIFIED':
+                    month_speakers[month_key].add(speaker['id'])
+
+            # Count topics
+            month_topics[month_key].update(topics)
+
+        except Exception as e:
+            print(f"Warning: Could not parse date {date_str}: {e}")
+
+    speaker_result = []
+    for key, name in speaker_names.items():
+        canonical = speaker_canonical[key]
+        speaker_result.append({
+            'id': canonical['id'] if canonical else key.upper().replace(' ', '-'),
+            'name': canonical['name'] if canonical else name,
+            'type': (canonical or {}).get('type', 'desconocido'),
+            'role': (canonical or {}).get('role'),
+            'party': (canonical or {}).get('party'),
+            'province': (canonical or {}).get('province'),
+            'total_time': speaker_time[key],
+            'total_interventions': speaker_interventions[key],
+            'sessions_attended': len(speaker_sessions[key]),
+            'topics_discussed': len(speaker_topics[key]),
+        })
+
+    # Sort by total time (descending)
+    speaker_result.sort(key=itemgetter('total_time'), reverse=True)
+
+    topic_result = [
+        {'topic': topic, 'count': count, 'sessions': topic_sessions[topic]}
+        for topic, count in topic_count.items()
+    ]
+
+    # Sort by count (descending)
+    topic_result.sort(key=itemgetter('count'), reverse=True)
+
+    monthly_result = [
+        {
+            'month': month,
+            'sessions_count': month_sessions[month],
+            'total_duration': month_duration[month],
+            'unique_speakers': len(month_speakers[month]),
+            'unique_topics': len(month_topics[month])
+        }
+        for month in sorted(month_sessions)
+    ]
+
+    return speaker_result, topic_result, monthly_result
+
+
+def generate_all_stats(sessions):
+    """Generate speaker, topic and monthly statistics in one pass (see tally_all_stats)
+
+    Returns:
+        (speaker_stats, topic_stats, monthly_stats)
+    """
+    tally = tally_all_stats(sessions)
+    while True:
+        try:
+            next(tally)
+        except StopIteration as done:
+            return done.value
+
+
+def generate_speaker_stats(sessions):
+    """Generate per-speaker participation statistics (see generate_all_stats)"""
+    return generate_all_stats(sessions)[0]
+
+
+def generate_topic_stats(sessions):
+    """Generate topic distribution statistics (see generate_all_stats)"""
+    return generate_all_stats(sessions)[1]
+
+
+def generate_monthly_stats(sessions):
+    """Generate monthly statistics (see generate_all_stats)"""
+    return generate_all_stats(sessions)[2]
+
+
+def save_stats(stats_data, output_path, pretty=False):
+    """Save statistics to JSON file (compact unless pretty)"""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    dump_json(stats_data, output_path, pretty=pretty)
+
+    print(f"✓ Statistics saved to: {output_path}")
+
+
+
+# ---------------------------------------------------------------------------
+# Search index (07)
+# ---------------------------------------------------------------------------
+
+def normalize_search_text(text, max_bytes=None):
+    """Fold text for the search index: NFKD, strip diacritics, lowercase.
+
+    With max_bytes, truncate to that many UTF-8 bytes (never splitting a
+    character). Clients should fold queries the same way before matching.
+    """
+    nfkd = unicodedata.normalize('NFKD', text)
+    folded = ''.join(c for c in nfkd if not unicodedata.combining(c)).lower()
+    if max_bytes is None:
+        return folded
+    return folded.encode('utf-8')[:max_bytes].decode('utf-8', errors='ignore')
+
+
+def search_document(session):
+    """
+    Build the search document for one session
+
+    Each document contains:
+    - id: Unique session ID
+    - title: Session title (normalized, see normalize_search_text)
+    - date: Session date
+    - transcript: Transcript text, normalized and cut to TRANSCRIPT_INDEX_BYTES
+    - speakers: List of speaker names
+    - topics: List of topics
+    - keywords: List of keywords (normalized)
+    """
+    # Bound once per session: every field below is a .get() on one of these
+    get = session.get
+
+    # Extract speaker names
+    speaker_names = [
+        speaker['name'] for speaker in get('speaker_stats') or ()
+        if speaker['id'] != 'UNIDENTIFIED'
+    ]
+
+    # Get classification data
+    classification = get('classification') or {}
+    get_class = classification.get
+
+    # Build document
+    return {
+        'id': get('id', ''),
+        'title': normalize_search_text(get('title', '')),
+        'date': get('date', ''),
+        'url': get('source_url', ''),
+        'transcript': normalize_search_text(get('text', ''), TRANSCRIPT_INDEX_BYTES),  # Limit for index size
+        'speakers': speaker_names,
+        'topics': get_class('topics', []),
+        'keywords': [normalize_search_text(keyword) for keyword in get_class('keywords', [])],
+        'summary': get_class('summary', ''),
+        'duration': get('duration', 0)
+    }
+
+
+def save_search_index(documents, output_path, total_documents=None, pretty=False):
+    """Save search index to JSON file (compact unless pretty)
+
+    `documents` may be a generator: it is streamed to disk one document at
+    a time, so the serialized index is never materialized in memory. Pass
+    `total_documents` when it can't be len()'d.
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Index header; the documents list is appended after it
+    head = {
+        'generated_at': datetime.now().isoformat(),
+        'total_documents': len(documents) if total_documents is None else total_documents,
+    }
+
+    dump_json_stream(output_path, head, 'documents', documents, pretty=pretty)
+
+    # Calculate file size
+    file_size_kb = output_path.stat().st_size / 1024
+    print(f"✓ Search index saved to: {output_path}")
+    print(f"  File size: {file_size_kb:.2f} KB")
+
+
+def save_search_shards(documents, output_dir, total_documents, pretty=False):
+    """Save the search index as per-field gzip shards plus a manifest
+
+    Every shard is a compact JSON array of {'id', <fields>} in document
+    order, written as documents stream past. gzip rather than brotli: it
+    needs no extra dependency and every browser decompresses it natively
+    (DecompressionStream), whereas GitHub Pages won't serve .br with a
+    Content-Encoding header. mtime=0 keeps the output byte-reproducible.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    shards = {
+        name: gzip.GzipFile(output_dir / f"{name}.json.gz", 'wb', compresslevel=9, mtime=0)
+        for name in SHARD_FIELDS
+    }
+    try:
+        for shard in shards.values():
+            shard.write(b'[')
+        for count, doc in enumerate(documents):
+            for name, fields in SHARD_FIELDS.items():
+                row = {'id': doc['id']}
+                for field in fields:
+                    row[field] = doc[field]
+                shards[name].write((b',' if count else b'') + orjson.dumps(row))
+        for shard in shards.values():
+            shard.write(b']')
+    finally:
+        for shard in shards.values():
+            shard.close()
+
+    manifest = {
+        'generated_at': datetime.now().isoformat(),
+        'total_documents': total_documents,
+        'encoding': 'gzip',
+        'shards': {
+            name: {
+                'path': f"{name}.json.gz",
+                'fields': ['id', *fields],
+                'bytes': (output_dir / f"{name}.json.gz").stat().st_size,
+            }
+            for name, fields in SHARD_FIELDS.items()
+        },
+    }
+    dump_json(manifest, output_dir / "manifest.json", pretty=pretty)
+
+    print(f"✓ Search index shards saved to: {output_dir}")
+    for name, info in manifest['shards'].items():
+        print(f"  {info['path']}: {info['bytes'] / 1024:.2f} KB")
+
+
+# ---------------------------------------------------------------------------
+# Static-site data sync
+# ---------------------------------------------------------------------------
+# GitHub Pages cannot follow symlinks, so docs/data is a real copy of data/.
+# Every time the site is rebuilt we mirror data/ → docs/data/, and we also
+# warn at the start if the two trees were out of sync (so manual edits to one
+# but not the other don't slip through).
+
+def _list_relative(root: Path) -> set:
+    return {p.relative_to(root) for p in root.rglob("*") if p.is_file()}
+
+
+def check_docs_data_sync(verbose: bool = True) -> tuple[bool, list[str]]:
+    """Return (in_sync, list_of_drift_paths). Compares data/ ↔ docs/data/."""
+    src = PROJECT_ROOT / "data"
+    dst = PROJECT_ROOT / "docs" / "data"
+    if not dst.exists():
+        return False, ["docs/data does not exist"]
+    drift: list[str] = []
+    src_files = _list_relative(src)
+    dst_files = _list_relative(dst)
+    for rel in sorted(src_files - dst_files):
+        drift.append(f"missing in docs/data: {rel}")
+    for rel in sorted(dst_files - src_files):
+        drift.append(f"stale in docs/data: {rel}")
+    for rel in sorted(src_files & dst_files):
+        if not filecmp.cmp(src / rel, dst / rel, shallow=False):
+            drift.append(f"differs: {rel}")
+    if drift and verbose:
+        print(f"⚠ docs/data is out of sync with data/ ({len(drift)} differences)")
+    return len(drift) == 0, drift
+
+
+def sync_docs_data() -> tuple[int, int, int]:
+    """Mirror data/ → docs/data/. Returns (copied, deleted, unchanged)."""
+    src = PROJECT_ROOT / "data"
+    dst = PROJECT_ROOT / "docs" / "data"
+    dst.mkdir(parents=True, exist_ok=True)
+    copied = deleted = unchanged = 0
+
+    src_files = _list_relative(src)
+    dst_files = _list_relative(dst)
+
+    # Copy new + changed
+    for rel in src_files:
+        s = src / rel
+        d = dst / rel
+        if d.exists() and filecmp.cmp(s, d, shallow=False):
+            unchanged += 1
+            continue
+        d.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(s, d)
+        copied += 1
+
+    # Remove orphan files in docs/data that no longer exist in data/
+    for rel in dst_files - src_files:
+        try:
+            (dst / rel).unlink()
+            deleted += 1
+        except OSError:
+            pass
+
+    # Clean up empty directories in docs/data
+    for d in sorted((p for p in dst.rglob("*") if p.is_dir()), reverse=True):
+        try:
+            d.rmdir()
+        except OSError:
+            pass
+
+    return copied, deleted, unchanged
+
+
+# ---------------------------------------------------------------------------
+# Catalog and topic mapping (08)
+# ---------------------------------------------------------------------------
+
+def catalog_entry(session_info):
+    """
+    Build the catalog entry for one {'file_path', 'data'} session
+
+    Each catalog entry contains:
+    - id, title, date, duration
+    - speakers, topics, keywords
+    - summary, url, file_path
+    """
+    session = session_info['data']
+    # Bound once per session: every field below is a .get() on one of these
+    get = session.get
+
+    # Extract speaker count
+    speaker_count = sum(1 for s in get('speaker_stats') or () if s['id'] != 'UNIDENTIFIED')
+
+    # Get classification
+    classification = get('classification') or {}
+    get_class = classification.get
+
+    return {
+        'id': get('id', ''),
+        'title': get('title', ''),
+        'date': get('date', ''),
+        'duration': get('duration', 0),
+        'url': get('source_url', ''),
+        'file_path': session_info['file_path'],
+        'video_type': get('video_type', 'clip'),
+        'speaker_count': speaker_count,
+        'topics': get_class('topics', []),
+        'keywords': get_class('keywords', [])[:10],  # Limit keywords
+        'summary': get_class('summary', ''),
+        'bills_mentioned': len(get_class('bills', []))
+    }
+
+
+def sort_catalog(catalog):
+    """Sort catalog entries by date (newest first), in place"""
+    catalog.sort(key=itemgetter('date'), reverse=True)
+    return catalog
+
+
+def build_session_catalog(sessions):
+    """Build master session catalog with metadata (see catalog_entry)"""
+    return sort_catalog([catalog_entry(session_info) for session_info in sessions])
+
+
+def add_topic_refs(topic_map, session):
+    """Append a {'id', 'title', 'date'} reference to `session` under each of its topics"""
+    get = session.get
+    topics = (get('classification') or {}).get('topics')
+    if not topics:
+        return
+
+    session_id = get('id', '')
+    session_title = get('title', '')
+    session_date = get('date', '')
+
+    for topic in topics:
+        topic_map[topic].append({
+            'id': session_id,
+            'title': session_title,
+            'date': session_date
+        })
+
+
+def finish_topic_mapping(topic_map):
+    """Turn a topic -> [session refs] map into the sorted topic mapping list"""
+    result = []
+    for topic, sessions in sorted(topic_map.items()):
+        result.append({
+            'topic': topic,
+            'count': len(sessions),
+            'sessions': sorted(sessions, key=itemgetter('date'), reverse=True)
+        })
+
+    # Sort by count (descending)
+    result.sort(key=itemgetter('count'), reverse=True)
+
+    return result
+
+
+def build_topic_mapping(sessions):
+    """Build topic-to-sessions mapping"""
+    topic_map = defaultdict(list)
+    for session_info in sessions:
+        add_topic_refs(topic_map, session_info['data'])
+    return finish_topic_mapping(topic_map)
+
+
+def save_catalog(catalog_data, output_path, list_key, pretty=False):
+    """Save catalog to JSON file (compact unless pretty), streaming the `list_key` entries one at a time"""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    head = {k: v for k, v in catalog_data.items() if k != list_key}
+    dump_json_stream(output_path, head, list_key, catalog_data[list_key], pretty=pretty)
+
+    print(f"✓ Catalog saved to: {output_path}")
+
+
+# ---------------------------------------------------------------------------
+# Orchestrator
+# ---------------------------------------------------------------------------
+
+def build_all(sessions, emit=EMIT_TARGETS, write_search=None):
+    """
+    Build the `emit` artifacts in a single pass over sessions
+
+    Args:
+        sessions: Iterable of {'file_path', 'data'} sessions (load_all_sessions(with_paths=True))
+        emit: Artifacts to build, any of EMIT_TARGETS
+        write_search: Required with 'search'. Called once with the search
+                      documents as a generator; consuming it drives the pass,
+                      so documents are written as they are built and never
+                      held as a list.
+
+    Returns:
+        {target: result} for each emitted target:
+        - stats: (speaker_stats, topic_stats, monthly_stats) plus 'total_sessions'
+        - search: (totals, sample) for print_index_summary — document, speaker,
+                  topic and keyword counts, and the first document
+        - catalog: sorted catalog entries
+        - topics: sorted topic mapping
+    """
+    catalog = []
+    topic_map = defaultdict(list)
+    totals = Counter()
+    samples = []
+    aggregates = {}
+
+    # Catalog and topics are built per session as the pass pulls sessions
+    # through, so every session is visited exactly once.
+    def visit(session_infos):
+        for session_info in session_infos:
+            session = session_info['data']
+            totals['sessions'] += 1
+            if 'catalog' in emit:
+                catalog.append(catalog_entry(session_info))
+            if 'topics' in emit:
+                add_topic_refs(topic_map, session)
+            yield session
+
+    def sessions_pass():
+        visited = visit(sessions)
+        if 'stats' in emit:
+            aggregates['stats'] = yield from tally_all_stats(visited)
+        else:
+            yield from visited
+
+    def search_documents():
+        for session in sessions_pass():
+            doc = search_document(session)
+            totals['documents'] += 1
+            totals['speakers'] += len(doc['speakers'])
+            totals['topics'] += len(doc['topics'])
+            totals['keywords'] += len(doc['keywords'])
+            if not samples:
+                samples.append(doc)
+            yield doc
+
+    if 'search' in emit:
+        write_search(search_documents())
+        aggregates['search'] = (totals, samples[0] if samples else None)
+    else:
+        deque(sessions_pass(), maxlen=0)
+    aggregates['total_sessions'] = totals['sessions']
+
+    if 'catalog' in emit:
+        aggregates['catalog'] = sort_catalog(catalog)
+    if 'topics' in emit:
+        aggregates['topics'] = finish_topic_mapping(topic_map)
+    return aggregates
+
+
+def print_stats_summary(total_sessions, speaker_stats, topic_stats, monthly_stats):
+    print("\n" + "="*60)
+    print("STATISTICS SUMMARY")
+    print("="*60)
+    print(f"Total sessions: {total_sessions}")
+    print(f"Unique speakers: {len(speaker_stats)}")
+    print(f"Unique topics: {len(topic_stats)}")
+    print(f"Months covered: {len(monthly_stats)}")
+
+    if speaker_stats:
+        print(f"\nTop 5 speakers by participation time:")
+        for speaker in speaker_stats[:5]:
+            print(f"  • {speaker['name']}: {speaker['total_time']/60:.1f} min ({speaker['sessions_attended']} sessions)")
+
+    if topic_stats:
+        print(f"\nTop 5 topics:")
+        for topic in topic_stats[:5]:
+            print(f"  • {topic['topic']}: {topic['count']} sessions")
+
+
+def print_index_summary(totals, sample):
+    print("\n" + "="*60)
+    print("INDEX SUMMARY")
+    print("="*60)
+    print(f"Total documents: {totals['documents']}")
+
+    if sample:
+        print(f"Total speaker mentions: {totals['speakers']}")
+        print(f"Total topic tags: {totals['topics']}")
+        print(f"Total keywords: {totals['keywords']}")
+
+        # Show sample document
+        print("\nSample document (first):")
+        print(f"  ID: {sample['id']}")
+        print(f"  Title: {sample['title']}")
+        print(f"  Date: {sample['date']}")
+        print(f"  Speakers: {', '.join(sample['speakers'][:3])}...")
+        print(f"  Topics: {', '.join(sample['topics'])}")
+
+
+def print_catalog_summary(catalog, topic_mapping):
+    print("\n" + "="*60)
+    print("CATALOG SUMMARY")
+    print("="*60)
+    if catalog is not None:
+        print(f"Total sessions: {len(catalog)}")
+    if topic_mapping is not None:
+        print(f"Total topics: {len(topic_mapping)}")
+
+    if catalog:
+        # Show date range
+        dates = [s['date'] for s in catalog if s['date']]
+        if dates:
+            print(f"Date range: {min(dates)} to {max(dates)}")
+
+        # Show most recent sessions
+        print(f"\nMost recent sessions (top 5):")
+        for session in catalog[:5]:
+            print(f"  • {session['date']}: {session['title']}")
+
+    if topic_mapping:
+        print(f"\nTop 5 topics by session count:")
+        for topic in topic_mapping[:5]:
+            print(f"  • {topic['topic']}: {topic['count']} sessions")
+
+
+def run(emit=EMIT_TARGETS, stats_dir='data/stats', search_path='data/search/index.json',
+        shards=None, catalog_path='data/catalog.json', topics_path='data/topics/topic-sessions.json',
+        pretty=False):
+    """
+    Load the sessions once and write the `emit` artifacts
+
+    Paths are relative to the project root. With `shards`, the search index
+    is written as per-field gzip shards to that directory instead of
+    `search_path`. Emitting 'catalog' also syncs data/ to docs/data/.
+
+    Returns:
+        Process exit code
+    """
+    emit = tuple(target for target in EMIT_TARGETS if target in emit)
+
+    # The data/ ↔ docs/data/ drift check only reads files and nothing is
+    # written before the final sync, so it runs alongside the session load
+    # instead of before it.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        drift_check = pool.submit(check_docs_data_sync, False) if 'catalog' in emit else None
+
+        # Load all sessions. The transcript prefix is only kept when the
+        # search index needs it.
+        print("Loading session data...")
+        text_limit = TRANSCRIPT_INDEX_CHARS if 'search' in emit else 0
+        sessions = load_all_sessions(with_paths=True, text_limit=text_limit)
+        print(f"✓ Loaded {len(sessions)} session(s)")
+
+    if drift_check:
+        # Sanity check: warn if data/ and docs/data/ have drifted (manual edits).
+        in_sync, drift = drift_check.result()
+        if not in_sync:
+            print(f"⚠ docs/data is out of sync with data/ ({len(drift)} differences)")
+            for line in drift[:5]:
+                print(f"    {line}")
+            if len(drift) > 5:
+                print(f"    … and {len(drift) - 5} more")
+            print("  → will be reconciled by the final sync step below")
+
+    # One search document per loaded session; the count goes in the index
+    # header, which is written before the documents stream past.
+    total_documents = len(sessions)
+
+    def write_search(documents):
+        if shards:
+            save_search_shards(documents, PROJECT_ROOT / shards, total_documents=total_documents, pretty=pretty)
+        else:
+            save_search_index(documents, PROJECT_ROOT / search_path, total_documents=total_documents, pretty=pretty)
+
+    print(f"Building {', '.join(emit)}...")
+    aggregates = build_all(sessions, emit, write_search)
+    del sessions
+
+    if 'stats' in emit:
+        if aggregates['total_sessions']:
+            speaker_stats, topic_stats, monthly_stats = aggregates['stats']
+            all_stats = {
+                'generated_at': datetime.now().isoformat(),
+                'total_sessions': aggregates['total_sessions'],
+                'speaker_stats': speaker_stats,
+                'topic_stats': topic_stats,
+                'monthly_stats': monthly_stats
+            }
+            save_stats(all_stats, PROJECT_ROOT / stats_dir / "all-time.json", pretty=pretty)
+            print_stats_summary(aggregates['total_sessions'], speaker_stats, topic_stats, monthly_stats)
+        else:
+            print("\nNo sessions found. No statistics to generate.")
+
+    if 'search' in emit:
+        print_index_summary(*aggregates['search'])
+
+    if 'catalog' in emit:
+        catalog_output = {
+            'generated_at': datetime.now().isoformat(),
+            'total_sessions': len(aggregates['catalog']),
+            'sessions': aggregates['catalog']
+        }
+        save_catalog(catalog_output, PROJECT_ROOT / catalog_path, 'sessions', pretty=pretty)
+
+    if 'topics' in emit:
+        topic_output = {
+            'generated_at': datetime.now().isoformat(),
+            'total_topics': len(aggregates['topics']),
+            'topics': aggregates['topics']
+        }
+        save_catalog(topic_output, PROJECT_ROOT / topics_path, 'topics', pretty=pretty)
+
+    if 'catalog' in emit or 'topics' in emit:
+        print_catalog_summary(aggregates.get('catalog'), aggregates.get('topics'))
+
+    if 'catalog' in emit:
+        # Mirror data/ → docs/data/ so GitHub Pages serves the fresh files.
+        print("\nSyncing docs/data/ from data/ for GitHub Pages…")
+        copied, deleted, unchanged = sync_docs_data()
+        print(f"  copied/updated: {copied}   deleted: {deleted}   unchanged: {unchanged}")
+
+    return 0
+
+
+def main(argv=None):
+    """Main function (argv: argument list, default sys.argv[1:])"""
+    parser = argparse.ArgumentParser(description='Build stats, search index, catalog and topic mappings from one load of the sessions')
+    parser.add_argument('--emit', nargs='+', choices=EMIT_TARGETS, default=list(EMIT_TARGETS),
+                        help='Artifacts to build (default: all)')
+    parser.add_argument('--stats-dir', default='data/stats', help='Output directory for statistics')
+    parser.add_argument('--search-path', default='data/search/index.json', help='Output path for search index')
+    parser.add_argument('--shards', metavar='DIR',
+                        help='Write the search index as per-field gzip shards + manifest.json to DIR instead')
+    parser.add_argument('--catalog-path', default='data/catalog.json', help='Output path for session catalog')
+    parser.add_argument('--topics-path', default='data/topics/topic-sessions.json', help='Output path for topic mappings')
+    parser.add_argument('--pretty', action='store_true', help='Indent JSON output (default: compact; the frontend is the only reader)')
+
+    args = parser.parse_args(argv)
+
+    print("="*60)
+    print("AGGREGATE - Build Site Data")
+    print("="*60)
+
+    rc = run(
+        emit=args.emit,
+        stats_dir=args.stats_dir,
+        search_path=args.search_path,
+        shards=args.shards,
+        catalog_path=args.catalog_path,
+        topics_path=args.topics_path,
+        pretty=args.pretty,
+    )
+
+    print("\n" + "="*60)
+    print(f"COMPLETE - Site data rebuilt")
+    print("="*60)
+
+    return rc
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,13 +7,17 @@ Processes a complete session from video ID to final catalog update
 import sys
 import os
 import argparse
-import json
+import importlib.util
+from functools import lru_cache
 from pathlib import Path
 import subprocess
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.append(str(PROJECT_ROOT))
+# Pipeline scripts import their siblings (_common, aggregate) directly
+PIPELINE_DIR = PROJECT_ROOT / "scripts" / "pipeline"
+sys.path.append(str(PIPELINE_DIR))
 
 
 def run_script(script_path, args=None, description=""):
@@ -34,6 +38,35 @@ def run_script(script_path, args=None, description=""):
         return False
 
 
+@lru_cache(maxsize=None)
+def load_step(script_path):
+    """Import a pipeline script as a module (0X_*.py names aren't importable by name)"""
+    spec = importlib.util.spec_from_file_location(Path(script_path).stem, script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_step(script_path, args=None, description=""):
+    """Run a pipeline script's main() in this process and return success status
+
+    Saves an interpreter start and the re-import of the script's
+    dependencies per step. Used for the steps whose main() takes an
+    argument list; run_script is kept for the rest.
+    """
+    print(f"\n{'='*60}")
+    print(f"Running: {description}")
+    print(f"{'='*60}")
+
+    try:
+        return load_step(script_path).main(args or []) in (0, None)
+    except SystemExit as e:  # argparse errors, load_config() bailing out
+        return e.code in (0, None)
+    except Exception as e:
+        print(f"Error running {script_path}: {e}")
+        return False
+
+
 def main():
     """Main orchestrator"""
     parser = argparse.ArgumentParser(description='Process a complete Asamblea Nacional session')
@@ -52,16 +85,15 @@ def main():
     audio_path = PROJECT_ROOT / "temp" / "audio" / f"{video_id}.m4a"
     transcript_path = PROJECT_ROOT / "temp" / "transcripts" / f"{video_id}.json"
     identified_path = PROJECT_ROOT / "temp" / "identified" / f"{video_id}_identified.json"
-    classified_path = PROJECT_ROOT / "temp" / "classified" / f"{video_id}_classified.json"
     session_path = PROJECT_ROOT / "data" / "sessions" / f"{video_id}.json"
 
     # Step 1: Download audio (unless skip flag is set)
     if args.skip_download and audio_path.exists():
         print(f"\nSkipping download, using existing: {audio_path}")
     else:
-        success = run_script(
-            PROJECT_ROOT / "scripts" / "pipeline" / "02_download_audio.py",
-            ["--video-id", video_id],
+        success = run_step(
+            PIPELINE_DIR / "02_download_audio.py",
+            ["--video-id", video_id, "--output-dir", str(audio_path.parent)],
             "Step 1: Download Audio"
         )
         if not success:
@@ -88,69 +120,31 @@ def main():
         print("\n❌ Failed at Step 3: Speaker Identification")
         return 1
 
-    # Step 4: Classify topics
-    success = run_script(
-        PROJECT_ROOT / "scripts" / "pipeline" / "05_classify_topics.py",
-        ["--transcript-path", str(identified_path), "--output-path", str(classified_path)],
-        "Step 4: Classify Topics"
+    # Steps 4-5: Classify topics and save the session to data/sessions.
+    # 05 adds the video metadata and writes the session file itself, so the
+    # classified result isn't written to temp/ and read back just to add it.
+    success = run_step(
+        PIPELINE_DIR / "05_classify_topics.py",
+        ["--transcript-path", str(identified_path), "--video-id", video_id,
+         "--session-out-path", str(session_path)],
+        "Steps 4-5: Classify Topics and Save Session Data"
     )
     if not success:
         print("\n❌ Failed at Step 4: Topic Classification")
         return 1
 
-    # Step 5: Save session to data directory
-    print(f"\n{'='*60}")
-    print("Step 5: Save Session Data")
-    print(f"{'='*60}")
-
-    try:
-        # Load classified data
-        with open(classified_path, 'r', encoding='utf-8') as f:
-            session_data = json.load(f)
-
-        # Add video metadata
-        session_data['id'] = video_id
-        session_data['video_id'] = video_id
-        session_data['source_url'] = f"https://www.youtube.com/watch?v={video_id}"
-
-        # Save to data/sessions
-        session_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(session_path, 'w', encoding='utf-8') as f:
-            json.dump(session_data, f, indent=2, ensure_ascii=False)
-
-        print(f"✓ Session saved to: {session_path}")
-
-    except Exception as e:
-        print(f"❌ Error saving session: {e}")
-        return 1
-
-    # Step 6: Generate statistics (unless skip flag is set)
+    # Steps 6-8: Statistics (unless skip flag is set), search index and
+    # catalog, from a single load of the sessions
+    emit = ['search', 'catalog', 'topics']
     if not args.skip_stats:
-        success = run_script(
-            PROJECT_ROOT / "scripts" / "pipeline" / "06_generate_stats.py",
-            [],
-            "Step 6: Generate Statistics"
-        )
-        if not success:
-            print("\n⚠️  Warning: Statistics generation failed")
-
-    # Step 7: Build search index
-    success = run_script(
-        PROJECT_ROOT / "scripts" / "pipeline" / "07_build_search_index.py",
-        [],
-        "Step 7: Build Search Index"
-    )
-    if not success:
-        print("\n⚠️  Warning: Search index build failed")
-
-    # Step 8: Update catalog
-    success = run_script(
-        PROJECT_ROOT / "scripts" / "pipeline" / "08_update_catalog.py",
-        [],
-        "Step 8: Update Catalog"
+        emit.insert(0, 'stats')
+    success = run_step(
+        PIPELINE_DIR / "aggregate.py",
+        ['--emit', *emit],
+        "Steps 6-8: Statistics, Search Index and Catalog"
     )
     if not success:
-        print("\n⚠️  Warning: Catalog update failed")
+        print("\n⚠️  Warning: Site data rebuild failed")
 
     # Success!
     print("\n" + "="*60)
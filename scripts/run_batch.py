@@ -398,15 +398,16 @@ def main():
     if successes > 0:
         log("")
         log("Rebuilding site data (stats, search index, catalog)…")
-        for script in ("06_generate_stats.py", "07_build_search_index.py", "08_update_catalog.py"):
-            rc = subprocess.call(
-                [sys.executable, "-u", str(PROJECT_ROOT / "scripts" / "pipeline" / script)],
-                stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT,
-            )
-            if rc != 0:
-                log(f"  ⚠ {script} exited with code {rc}")
-            else:
-                log(f"  ✓ {script}")
+        # One aggregate.py run replaces 06/07/08: the sessions are loaded once
+        script = "aggregate.py"
+        rc = subprocess.call(
+            [sys.executable, "-u", str(PROJECT_ROOT / "scripts" / "pipeline" / script)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT,
+        )
+        if rc != 0:
+            log(f"  ⚠ {script} exited with code {rc}")
+        else:
+            log(f"  ✓ {script}")
 
     return 0 if successes == len(results) else 1
 
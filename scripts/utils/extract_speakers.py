@@ -4,16 +4,99 @@ Extract speaker names from transcripts using pattern matching and NLP.
 This identifies mentions of asambleístas in the transcript text.
 """
 
-import json
 import re
+import hashlib
 from pathlib import Path
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import logging
 
+import orjson
+
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+# Per-transcript results of identify_speakers_in_session, keyed by sha1 of the
+# text. Bump EXTRACTOR_VERSION whenever the patterns, stopwords or dedup rules
+# change so stale entries are recomputed.
+SPEAKERS_CACHE_DIR = Path('temp/cache/speakers')
+EXTRACTOR_VERSION = "v3"
+
+# Session files handed to each worker process at a time in main()
+SESSIONS_PER_TASK = 16
+
+NAME_WORD = r'[A-ZÁÉÍÓÚÑ][a-záéíóúñ]+'
+NAME_END = r'(?:\s|,|\.|\?|!|$)'
+
+
+# All speaker-mention patterns as one regex, so the transcript is scanned
+# once instead of once per pattern. Each alternative is a named group
+# (its kind); the alternatives are wrapped in a lookahead so a match of one
+# kind never hides an overlapping match of another — see extract_speaker_names.
+# The leading [delia][laions] check (first two letters of every alternative:
+# el/la, do, li, in, as) rejects most positions before the alternation runs.
+def _speaker_mention_pattern(name_word):
+    return r'(?=[delia][laions])(?=' + '|'.join((
+        # Pattern 1: "el/la asambleísta [Name]" - capture 2-3 words max
+        rf'(?P<asambleista>(?:el|la)\s+asambleísta\s+(?P<asambleista_name>{name_word}(?:\s+{name_word}){{1,2}}){NAME_END})',
+        # Pattern 2: "el/la legislador/a [Name]"
+        rf'(?P<legislador>(?:el|la)\s+legislador(?:a)?\s+(?P<legislador_name>{name_word}(?:\s+{name_word}){{1,2}}){NAME_END})',
+        # Pattern 3: Names with titles (doctor, doctora, licenciado, etc.)
+        rf'(?P<titled>(?:doctor|doctora|licenciado|licenciada|ingeniero|ingeniera)\s+(?P<titled_name>{name_word}(?:\s+{name_word}){{1,2}}){NAME_END})',
+        # Pattern 4: "asambleístas [Name1], [Name2], [Name3]"
+        rf'(?P<listed>asambleístas?\s+(?P<listed_first>{name_word}\s+{name_word})(?:,\s*(?P<listed_more>{name_word}\s+{name_word}))*)',
+    )) + r')'
+
+
+SPEAKER_MENTION_RE = re.compile(_speaker_mention_pattern(NAME_WORD), re.IGNORECASE)
+# The same patterns, case-sensitive, for text lowercased up front: under
+# IGNORECASE the engine case-folds at every position it tries. NAME_WORD
+# ignoring case is just two or more of its letters.
+SPEAKER_MENTION_LOWER_RE = re.compile(_speaker_mention_pattern(r'[a-záéíóúñ]{2,}'))
+
+# Mention kind -> its name groups, in the order names are reported
+MENTION_NAME_GROUPS = {
+    'asambleista': ('asambleista_name',),
+    'legislador': ('legislador_name',),
+    'titled': ('titled_name',),
+    'listed': ('listed_first', 'listed_more'),
+}
+
+DIGIT_RE = re.compile(r'\d')
+
+# Stopwords and blacklisted phrases to filter out
+STOPWORDS = frozenset({
+    'de la', 'de las', 'del', 'de los', 'el presidente', 'la presidente',
+    'le voy', 'ha sido', 'hasta este', 'contamos con', 'las distintas',
+    'presidente de', 'representante de', 'respecto de', 'respecto a',
+    'voy a', 'va a', 'tiene que', 'hay que', 'debe ser',
+    'durante este', 'para el', 'para la', 'pero también', 'presentes contamos',
+    'registrados hasta', 'la lectura', 'el orden', 'este momento', 'muy buenos'
+})
+# Any stopword anywhere in a name (plain substring, like `stop in name`),
+# checked in one search instead of one `in` per stopword
+STOPWORD_RE = re.compile('|'.join(re.escape(stop) for stop in sorted(STOPWORDS)))
+
+# Common Spanish words that are NOT names
+NON_NAME_WORDS = frozenset({
+    'durante', 'para', 'pero', 'también', 'presentes', 'contamos',
+    'registrados', 'hasta', 'lectura', 'orden', 'momento', 'buenos',
+    'este', 'esta', 'estos', 'estas'
+})
+
+# Role/title suffixes stripped by normalize_speaker_name
+SUFFIX_RES = tuple(
+    re.compile(suffix, re.IGNORECASE) for suffix in (
+        r'\s+Presidente$',
+        r'\s+Presidenta$',
+        r'\s+Ha\s+Sido$',
+        r'\s+Ha$',
+        r'\s+Del?\s+',
+        r'\s+De\s+La$',
+    )
+)
+
 
 def extract_speaker_names(text):
     """
@@ -25,74 +108,63 @@ def extract_speaker_names(text):
     - "el legislador [Name]"
     - Names followed by common verbs (señaló, afirmó, expresó, etc.)
     """
-    speakers = []
-
-    # Pattern 1: "el/la asambleísta [Name]" - capture 2-3 words max
-    pattern1 = r'(?:el|la)\s+asambleísta\s+([A-ZÁÉÍÓÚÑ][a-záéíóúñ]+(?:\s+[A-ZÁÉÍÓÚÑ][a-záéíóúñ]+){1,2})(?:\s|,|\.|\?|!|$)'
-    matches1 = re.findall(pattern1, text, re.IGNORECASE)
-    speakers.extend(matches1)
-
-    # Pattern 2: "el/la legislador/a [Name]"
-    pattern2 = r'(?:el|la)\s+legislador(?:a)?\s+([A-ZÁÉÍÓÚÑ][a-záéíóúñ]+(?:\s+[A-ZÁÉÍÓÚÑ][a-záéíóúñ]+){1,2})(?:\s|,|\.|\?|!|$)'
-    matches2 = re.findall(pattern2, text, re.IGNORECASE)
-    speakers.extend(matches2)
-
-    # Pattern 3: Names with titles (doctor, doctora, licenciado, etc.)
-    pattern3 = r'(?:doctor|doctora|licenciado|licenciada|ingeniero|ingeniera)\s+([A-ZÁÉÍÓÚÑ][a-záéíóúñ]+(?:\s+[A-ZÁÉÍÓÚÑ][a-záéíóúñ]+){1,2})(?:\s|,|\.|\?|!|$)'
-    matches3 = re.findall(pattern3, text, re.IGNORECASE)
-    speakers.extend(matches3)
-
-    # Pattern 4: "asambleístas [Name1], [Name2], [Name3]"
-    pattern4 = r'asambleístas?\s+([A-ZÁÉÍÓÚÑ][a-záéíóúñ]+\s+[A-ZÁÉÍÓÚÑ][a-záéíóúñ]+)(?:,\s*([A-ZÁÉÍÓÚÑ][a-záéíóúñ]+\s+[A-ZÁÉÍÓÚÑ][a-záéíóúñ]+))*'
-    matches4 = re.findall(pattern4, text, re.IGNORECASE)
-    for match in matches4:
-        for name in match:
-            if name:
-                speakers.append(name)
-
-    # Stopwords and blacklisted phrases to filter out
-    stopwords = {
-        'de la', 'de las', 'del', 'de los', 'el presidente', 'la presidente',
-        'le voy', 'ha sido', 'hasta este', 'contamos con', 'las distintas',
-        'presidente de', 'representante de', 'respecto de', 'respecto a',
-        'voy a', 'va a', 'tiene que', 'hay que', 'debe ser',
-        'durante este', 'para el', 'para la', 'pero también', 'presentes contamos',
-        'registrados hasta', 'la lectura', 'el orden', 'este momento', 'muy buenos'
-    }
+    # One pass over the text. The lookahead reports a match at every position
+    # any pattern matches; skipping those that start inside the previous
+    # match of the same kind reproduces four separate non-overlapping
+    # re.findall scans, and grouping by kind keeps their output order.
+    # Matching runs case-sensitively on a lowercased copy; names are sliced
+    # from the original text by offset. A few characters change length when
+    # lowercased, which would shift the offsets — fall back to IGNORECASE.
+    text_lower = text.lower()
+    if len(text_lower) == len(text):
+        matches = SPEAKER_MENTION_LOWER_RE.finditer(text_lower)
+    else:
+        matches = SPEAKER_MENTION_RE.finditer(text)
+
+    mentions = {kind: [] for kind in MENTION_NAME_GROUPS}
+    resume_at = dict.fromkeys(MENTION_NAME_GROUPS, 0)
+    for match in matches:
+        kind = match.lastgroup
+        start, end = match.span(kind)
+        if start < resume_at[kind]:
+            continue
+        resume_at[kind] = end
+        names = mentions[kind]
+        for group in MENTION_NAME_GROUPS[kind]:
+            name_start, name_end = match.span(group)
+            if name_start != name_end:
+                names.append(text[name_start:name_end])
 
-    # Common Spanish words that are NOT names
-    non_name_words = {
-        'durante', 'para', 'pero', 'también', 'presentes', 'contamos',
-        'registrados', 'hasta', 'lectura', 'orden', 'momento', 'buenos',
-        'este', 'esta', 'estos', 'estas'
-    }
+    speakers = [name for names in mentions.values() for name in names]
 
     # Clean and normalize names
     cleaned_speakers = []
     for name in speakers:
-        # Remove extra whitespace
-        name = ' '.join(name.split())
-        # Title case
-        name = name.title()
+        # Remove extra whitespace and title-case. The regexes match
+        # case-insensitively, so a captured name isn't necessarily
+        # capitalized. Split once: title() never adds or removes spaces, so
+        # the word count below holds for the cleaned name too.
+        words = name.split()
+        name = ' '.join(words).title()
 
         # Skip if:
         # - Too short or contains numbers
         # - Contains stopwords
         # - Doesn't have at least 2 words (first + last name)
-        if len(name) < 6 or re.search(r'\d', name):
+        if len(name) < 6 or DIGIT_RE.search(name):
             continue
 
         name_lower = name.lower()
-        if any(stop in name_lower for stop in stopwords):
+        if STOPWORD_RE.search(name_lower):
             continue
 
-        word_count = len(name.split())
+        word_count = len(words)
         if word_count < 2 or word_count > 4:
             continue
 
         # Check if first word is a non-name word
-        first_word = name.split()[0].lower()
-        if first_word in non_name_words:
+        first_word = name_lower.partition(' ')[0]
+        if first_word in NON_NAME_WORDS:
             continue
 
         cleaned_speakers.append(name)
@@ -103,25 +175,17 @@ def extract_speaker_names(text):
 def normalize_speaker_name(name):
     """Normalize speaker name by removing common suffixes and cleaning."""
     # Remove common role/title suffixes
-    suffixes_to_remove = [
-        r'\s+Presidente$',
-        r'\s+Presidenta$',
-        r'\s+Ha\s+Sido$',
-        r'\s+Ha$',
-        r'\s+Del?\s+',
-        r'\s+De\s+La$',
-    ]
-
     normalized = name
-    for suffix in suffixes_to_remove:
-        normalized = re.sub(suffix, '', normalized, flags=re.IGNORECASE)
+    for suffix_re in SUFFIX_RES:
+        normalized = suffix_re.sub('', normalized)
 
     return normalized.strip()
 
 
 def deduplicate_speakers(speaker_counts):
     """Deduplicate speaker names that are likely the same person."""
-    # Group by base name (first 2 words)
+    # Group by base name (first 2 words), keeping a running best variant
+    # and total per base: base -> [best_name, best_count, total]
     base_names = {}
     for name, count in speaker_counts.items():
         # Normalize the name
@@ -131,20 +195,18 @@ def deduplicate_speakers(speaker_counts):
         # Use first 2 words as base
         if len(words) >= 2:
             base = ' '.join(words[:2])
-            if base not in base_names:
-                base_names[base] = []
-            base_names[base].append((normalized, count))
-
-    # Select the most mentioned version of each name
-    deduplicated = {}
-    for base, variants in base_names.items():
-        # Sort by count (descending) and name length (prefer shorter)
-        variants.sort(key=lambda x: (-x[1], len(x[0])))
-        best_name, total_count = variants[0]
-
-        # Sum all counts for this person
-        total = sum(count for _, count in variants)
-        deduplicated[best_name] = total
+            best = base_names.get(base)
+            if best is None:
+                base_names[base] = [normalized, count, count]
+                continue
+            best[2] += count
+            # Prefer the most mentioned version, then the shorter one; on a
+            # full tie the first seen wins
+            if count > best[1] or (count == best[1] and len(normalized) < len(best[0])):
+                best[0], best[1] = normalized, count
+
+    # Sum all counts for each person under its most mentioned version
+    deduplicated = {best_name: total for best_name, _, total in base_names.values()}
 
     return deduplicated
 
@@ -153,14 +215,19 @@ def identify_speakers_in_session(session_file):
     """Extract speakers from a single session JSON file."""
     logger.info(f"Processing {session_file.name}")
 
-    with open(session_file, 'r', encoding='utf-8') as f:
-        session = json.load(f)
+    session = orjson.loads(session_file.read_bytes())
 
     text = session.get('text', '')
     if not text:
         logger.warning(f"No transcript text in {session_file.name}")
         return []
 
+    cache_path = SPEAKERS_CACHE_DIR / f"{hashlib.sha1(text.encode('utf-8')).hexdigest()}.json"
+    cached = _read_speakers_cache(cache_path)
+    if cached is not None:
+        logger.info(f"Found {len(cached)} speakers mentioned 2+ times (cached)")
+        return list(cached)
+
     # Extract speaker names
     speaker_names = extract_speaker_names(text)
 
@@ -181,17 +248,31 @@ def identify_speakers_in_session(session_file):
         count = deduplicated[name]
         logger.info(f"  - {name} ({count} mentions)")
 
+    SPEAKERS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(cache_path, 'wb') as f:
+        f.write(orjson.dumps({'version': EXTRACTOR_VERSION, 'speakers': significant_speakers}))
+
     return significant_speakers
 
 
+def _read_speakers_cache(cache_path):
+    """Cached speaker list for a transcript, or None if missing/stale/unreadable."""
+    try:
+        entry = orjson.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if entry.get('version') != EXTRACTOR_VERSION:
+        return None
+    return entry['speakers']
+
+
 def update_speaker_database(speakers_from_sessions):
     """Update the speakers database with newly discovered speakers."""
     speakers_file = Path('data/speakers/asambleistas.json')
 
     # Load existing database
     if speakers_file.exists():
-        with open(speakers_file, 'r', encoding='utf-8') as f:
-            db = json.load(f)
+        db = orjson.loads(speakers_file.read_bytes())
     else:
         db = {
             'last_updated': datetime.now().isoformat(),
@@ -226,14 +307,21 @@ def update_speaker_database(speakers_from_sessions):
             new_speakers_added += 1
             logger.info(f"Added new speaker: {name}")
 
+    # Nothing new and the counts already agree: leave the file (and its
+    # last_updated) alone instead of re-encoding the whole database
+    if (not new_speakers_added and speakers_file.exists()
+            and db.get('total_count') == len(db['asambleistas'])):
+        logger.info(f"\nSpeaker database unchanged ({db['total_count']} speakers)")
+        return db
+
     # Update metadata
     db['last_updated'] = datetime.now().isoformat()
     db['total_count'] = len(db['asambleistas'])
 
     # Save
     speakers_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(speakers_file, 'w', encoding='utf-8') as f:
-        json.dump(db, f, ensure_ascii=False, indent=2)
+    with open(speakers_file, 'wb') as f:
+        f.write(orjson.dumps(db, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
     logger.info(f"\nSpeaker database updated:")
     logger.info(f"  - Total speakers: {db['total_count']}")
@@ -250,11 +338,13 @@ def main():
         logger.error(f"Sessions directory not found: {sessions_dir}")
         return
 
-    # Process all session files
+    # Process all session files. Extraction is CPU-bound regex work and
+    # independent per file, so it is spread over one process per core.
     all_speakers = set()
-    for session_file in sessions_dir.glob('*.json'):
-        speakers = identify_speakers_in_session(session_file)
-        all_speakers.update(speakers)
+    session_files = list(sessions_dir.glob('*.json'))
+    with ProcessPoolExecutor() as pool:
+        for speakers in pool.map(identify_speakers_in_session, session_files, chunksize=SESSIONS_PER_TASK):
+            all_speakers.update(speakers)
 
     logger.info(f"\n=== Total unique speakers found: {len(all_speakers)} ===")
 
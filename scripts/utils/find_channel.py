@@ -4,6 +4,7 @@ Helper script to find YouTube channel ID by searching
 """
 
 import sys
+from functools import lru_cache
 from pathlib import Path
 from googleapiclient.discovery import build
 
@@ -18,9 +19,18 @@ def load_config():
     with open(config_path, 'r') as f:
         return yaml.safe_load(f)
 
+@lru_cache(maxsize=None)
+def youtube_client(youtube_api_key):
+    """Build the YouTube Data API client once per key"""
+    # Use the discovery doc bundled with google-api-python-client (>=2.0)
+    # instead of fetching it over HTTPS on every run; cache_discovery=False
+    # also silences the oauth2client file_cache warning.
+    return build('youtube', 'v3', developerKey=youtube_api_key,
+                 static_discovery=True, cache_discovery=False)
+
 def search_channel(youtube_api_key, query):
     """Search for YouTube channels"""
-    youtube = build('youtube', 'v3', developerKey=youtube_api_key)
+    youtube = youtube_client(youtube_api_key)
 
     request = youtube.search().list(
         part='snippet',
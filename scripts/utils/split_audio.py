@@ -30,6 +30,7 @@ def split_audio(audio_path, chunk_duration_minutes=10):
     # Use ffmpeg to split the audio
     cmd = [
         'ffmpeg',
+        '-loglevel', 'error',
         '-i', str(audio_path),
         '-f', 'segment',
         '-segment_time', str(chunk_duration),
@@ -38,7 +39,13 @@ def split_audio(audio_path, chunk_duration_minutes=10):
     ]
 
     try:
-        subprocess.run(cmd, check=True, capture_output=True)
+        # stdout is unused; stderr only carries errors at -loglevel error, so
+        # piping it doesn't buffer per-segment progress for long sessions.
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            print(f"Error splitting audio: ffmpeg exited with status {result.returncode}")
+            print(f"STDERR: {result.stderr.decode(errors='replace')}")
+            return None
 
         # Get list of created chunks
         chunks = sorted(output_dir.glob('chunk_*.m4a'))
@@ -50,10 +57,6 @@ def split_audio(audio_path, chunk_duration_minutes=10):
 
         return chunks
 
-    except subprocess.CalledProcessError as e:
-        print(f"Error splitting audio: {e}")
-        print(f"STDERR: {e.stderr.decode()}")
-        return None
     except FileNotFoundError:
         print("Error: ffmpeg not found. Please install it:")
         print("  sudo apt-get install ffmpeg")
@@ -5,7 +5,7 @@ Fetches the list of 151 asambleístas and updates the local database
 """
 
 import sys
-import json
+import orjson
 import requests
 from pathlib import Path
 from datetime import datetime
@@ -28,12 +28,14 @@ def fetch_asambleistas():
         response = requests.get(url, timeout=30)
         response.raise_for_status()
 
-        data = response.json()
+        # Parse the raw body with orjson rather than response.json(), which
+        # decodes it to str first and then runs the stdlib json parser
+        data = orjson.loads(response.content)
         print(f"✓ Fetched {len(data)} asambleístas")
 
         return data
 
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         print(f"Error fetching data: {e}")
         return None
 
@@ -85,8 +87,8 @@ def save_speakers_database(speakers):
         "asambleistas": speakers
     }
 
-    with open(db_path, 'w', encoding='utf-8') as f:
-        json.dump(database, f, indent=2, ensure_ascii=False)
+    with open(db_path, 'wb') as f:
+        f.write(orjson.dumps(database, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
     print(f"✓ Database saved to: {db_path}")
     print(f"  Total asambleístas: {len(speakers)}")